@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from aset.agents.shared.base_agent import BaseAgent
+from aset.agents.shared.prompts import load_prompt
 from aset.llm.router.llm_router import LLMRouter
 from aset.project_state.state_store import (
     ProjectState,
@@ -20,7 +21,7 @@ class ArchitectAgent(BaseAgent):
         super().__init__(llm_router)
         self.project_root = project_root
         self._prompt_path = Path(__file__).with_name("prompt.md")
-        self._system_prompt = self._prompt_path.read_text()
+        self._system_prompt = load_prompt(str(self._prompt_path))
 
     def run(self, state: ProjectState) -> ProjectState:
         self.logger.info("Generating architecture for project.")
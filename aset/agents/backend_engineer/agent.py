@@ -1,16 +1,39 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import List, Tuple
 
 from aset.agents.shared.base_agent import BaseAgent
+from aset.agents.shared.prompts import load_prompt
 from aset.project_state.state_store import ProjectState
 from aset.llm.router.llm_router import LLMRequest
 from aset.utils.file_ops import ensure_dir
 
 
+# Independent slices of the canonical backend layout (see prompt.md), generated
+# as one batch. Every prompt shares the same system + spec/arch prefix.
+_MODULE_GROUPS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (
+        "project scaffolding",
+        (
+            "app/__init__.py",
+            "app/main.py",
+            "requirements.txt",
+            "run_backend.py",
+            "check_backend.py",
+            "README.md",
+            ".env.example",
+        ),
+    ),
+    ("data layer", ("app/models.py", "app/schemas.py", "app/deps.py")),
+    ("API layer", ("app/api/__init__.py", "app/api/routes.py")),
+)
+
+
 class BackendEngineerAgent(BaseAgent):
     """
-    Generates backend code as a big text blob.
+    Generates backend code as a big text blob, one batched LLM call per
+    module group, concatenated in layout order.
     DevOpsEngineerAgent is responsible for turning that into files.
     """
 
@@ -18,7 +41,7 @@ class BackendEngineerAgent(BaseAgent):
         super().__init__(llm_router)
         self.project_root = project_root
         self._prompt_path = Path(__file__).with_name("prompt.md")
-        self._system_prompt = self._prompt_path.read_text()
+        self._system_prompt = load_prompt(str(self._prompt_path))
 
     def run(self, state: ProjectState) -> ProjectState:
 
@@ -28,22 +51,30 @@ class BackendEngineerAgent(BaseAgent):
         spec = state.spec.clarified_spec
         arch = state.architecture.content
 
-        user_prompt = (
-            "CLARIFIED SPEC:\n\n"
-            f"{spec}\n\n"
-            "ARCHITECTURE:\n\n"
-            f"{arch}\n\n"
-            "Generate the backend codebase now, following the file bundle format."
-        )
-
-        req = LLMRequest(
-            messages=[
-                {"role": "system", "content": self._system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            role="code_gen",
-        )
-        output = self._call_llm(req)
+        # Shared, byte-identical prefix for every module group.
+        committed = [
+            {
+                "role": "user",
+                "content": f"CLARIFIED SPEC:\n\n{spec}\n\nARCHITECTURE:\n\n{arch}",
+            }
+        ]
+        reqs: List[LLMRequest] = []
+        for group, files in _MODULE_GROUPS:
+            user_prompt = (
+                f"Generate ONLY the {group} of the backend codebase now, following the file bundle format:\n"
+                + "".join(f"- backend/{f}\n" for f in files)
+                + "The remaining files are generated separately from the same spec and architecture; "
+                "import from them using the canonical layout and the names in the architecture."
+            )
+            reqs.append(
+                LLMRequest(
+                    static_system=self._system_prompt,
+                    committed=committed,
+                    recent=[{"role": "user", "content": user_prompt}],
+                    role="code_gen",
+                )
+            )
+        output = "\n\n".join(part.strip() for part in self._call_llm_batch(reqs))
 
         out_dir = ensure_dir(self.project_root / "project_state" / "codebase")
         raw_path = out_dir / "backend_generation.txt"
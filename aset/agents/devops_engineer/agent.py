@@ -1,20 +1,181 @@
 from __future__ import annotations
 
-import subprocess
+import asyncio
+import os
+import re
+import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
-import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from aset.agents.shared.base_agent import BaseAgent
+from aset.agents.shared.prompts import load_prompt
+from aset.llm.errors import TransientLLMError
 from aset.llm.router.llm_router import LLMRouter
 from aset.llm.router.llm_router import LLMRequest
 from aset.project_state.state_store import ProjectState
+from aset.utils.bulk_writer import BulkWriter
 from aset.utils.file_ops import ensure_dir
-from aset.utils.file_bundle import parse_file_bundle, write_file_bundle, FileBundleParseError
+from aset.utils.file_bundle import (
+    HASHES_FILE,
+    FileBundle,
+    FileBundleParseError,
+    parse_file_bundle,
+    read_until_bundle_complete,
+    write_file_bundle,
+)
 from .config import DevOpsRepairConfig
 
 
+# Directories under backend/ that we create ourselves and never show the LLM.
+_SKIP_DIRS = frozenset({".venv", "__pycache__"})
+
+
+# Section headers in the raw backend generation: FILE_BUNDLE blocks or
+# markdown "### File: `backend/app/main.py`" headings.
+_RAW_SECTION_RE = re.compile(
+    r"^(?:---FILE_START\s+(?P<bundle>.+?)---|#+\s*File:\s*`?(?P<md>[^`\s]+)`?)[ \t]*$",
+    re.M,
+)
+_LOG_PY_PATH_RE = re.compile(r"[\w/]+\.py")
+# pip's own failure lines ("ERROR: No matching distribution found for ...").
+_PIP_ERROR_RE = re.compile(r"^(?:ERROR|error):.*$", re.M)
+_RAW_BACKEND_BUDGET = 8000
+
+
+def _pip_errors(install_log: str) -> str:
+    """
+    The failing pip error lines of an install log. Unlike the full log
+    (venv creation output, download progress), these are stable across
+    reruns of the same failure.
+    """
+    return "\n".join(m.group(0).strip() for m in _PIP_ERROR_RE.finditer(install_log))
+
+
+def _relevant_raw_backend(raw_backend: str, logs: str, tree_str: str) -> str:
+    """
+    Slice the raw backend generation down to the sections worth re-sending:
+    files mentioned in the failing logs first, then files that never made
+    it into the backend tree. Falls back to the tail of the text when no
+    section can be matched.
+    """
+    headers = list(_RAW_SECTION_RE.finditer(raw_backend))
+    if not headers:
+        return raw_backend[-4000:]
+
+    def norm(path: str) -> str:
+        return path.strip().removeprefix("./").removeprefix("backend/")
+
+    sections: List[Tuple[str, str]] = []
+    for i, m in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(raw_backend)
+        sections.append((norm(m.group("bundle") or m.group("md")), raw_backend[m.start():end]))
+
+    mentioned = {norm(p) for p in _LOG_PY_PATH_RE.findall(logs)}
+    present = {line[4:] for line in tree_str.splitlines() if line.startswith("[F] ")}
+
+    def in_logs(path: str) -> bool:
+        return any(path.endswith(m) or m.endswith(path) for m in mentioned)
+
+    ranked = [body for path, body in sections if in_logs(path)]
+    ranked += [body for path, body in sections if not in_logs(path) and path not in present]
+
+    out: List[str] = []
+    used = 0
+    for body in ranked:
+        if used + len(body) > _RAW_BACKEND_BUDGET:
+            continue
+        out.append(body)
+        used += len(body)
+
+    return "".join(out) if out else raw_backend[-4000:]
+
+
+# Larger pipe buffers mean far fewer read() calls on verbose pip output (Linux, 3.10+).
+_PIPE_KWARGS = {"pipesize": 1 << 20} if sys.version_info >= (3, 10) and sys.platform.startswith("linux") else {}
+
+# Runs the backend check scripts in one interpreter so the venv's heavy
+# imports (fastapi, sqlmodel, ...) are paid once per iteration.
+_HARNESS_NAME = ".aset_harness.py"
+# Our own bookkeeping files in backend/; never shown to the LLM.
+_SKIP_FILES = frozenset({HASHES_FILE, _HARNESS_NAME})
+_HARNESS_SRC = """\
+import runpy
+import sys
+import traceback
+
+failed = False
+for header, argv in {steps!r}:
+    if header:
+        print(header, flush=True)
+    sys.argv = list(argv)
+    code = 0
+    try:
+        runpy.run_path(argv[0], run_name="__main__")
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            code = exc.code or 0
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    failed = failed or code != 0
+sys.exit(1 if failed else 0)
+"""
+
+
+def _venv_python(venv_dir: Path) -> Path:
+    if sys.platform.startswith("win"):
+        return venv_dir / "Scripts" / "python.exe"
+    return venv_dir / "bin" / "python"
+
+
+def _has_any_py_and_required(root: Path, required: List[str]) -> Tuple[bool, Set[str]]:
+    """
+    Single scandir DFS answering "is there any .py file?" and "which of
+    `required` (paths relative to root) are missing?". Stops as soon as
+    both are settled; DirEntry type info comes from readdir, so no extra stats.
+    """
+    missing = set(required)
+    has_py = False
+    stack = [(root, "")]
+    while stack and not (has_py and not missing):
+        directory, prefix = stack.pop()
+        try:
+            it = os.scandir(directory)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                rel = f"{prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS:
+                        stack.append((Path(entry.path), f"{rel}/"))
+                elif entry.is_file():
+                    missing.discard(rel)
+                    has_py = has_py or entry.name.endswith(".py")
+    return has_py, missing
+
+
+def _until_set(chunks: Iterator[str], event: threading.Event) -> Iterator[str]:
+    """Yield from `chunks` until `event` is set, then close the underlying stream."""
+    try:
+        for chunk in chunks:
+            if event.is_set():
+                return
+            yield chunk
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
 class DevOpsEngineerAgent(BaseAgent):
     """
     DevOps repair loop:
@@ -31,11 +192,40 @@ class DevOpsEngineerAgent(BaseAgent):
         self.project_root = project_root
         self.cfg = cfg or DevOpsRepairConfig()
         self._prompt_path = Path(__file__).with_name("prompt.md")
-        self._system_prompt = self._prompt_path.read_text()
+        self._system_prompt = load_prompt(str(self._prompt_path))
+        # root -> (root mtime_ns, tree string). The root mtime only notices
+        # top-level changes (e.g. .venv appearing); nested edits are covered by
+        # dropping the entry whenever a patch is applied.
+        self._tree_cache: Dict[Path, Tuple[int, str]] = {}
 
     # ---------- public entrypoint ----------
 
     def run(self, state: ProjectState) -> ProjectState:
+        """
+        Synchronous wrapper around `arun` for callers without an event loop.
+        """
+        return asyncio.run(self.arun(state))
+
+    async def prepare(self) -> None:
+        """
+        Create the backend venv ahead of time. It doesn't depend on the
+        generated code, so the orchestrator runs this alongside the
+        architecture/backend phases. Failures are logged, not raised;
+        `arun` retries venv creation anyway.
+        """
+        backend_root = ensure_dir(self.project_root / "project_state" / "codebase" / "backend")
+        devops_dir = ensure_dir(self.project_root / "project_state" / "devops")
+        lines: List[str] = []
+        try:
+            ok = await self._ensure_venv(backend_root, backend_root / ".venv", lines)
+        except Exception as exc:  # noqa: BLE001
+            ok = False
+            lines.append(f"{exc}\n")
+        (devops_dir / "prepare.log").write_text("".join(lines))
+        if not ok:
+            self.logger.warning("DevOps venv preparation failed; see %s", devops_dir / "prepare.log")
+
+    async def arun(self, state: ProjectState) -> ProjectState:
         """
         DevOps repair loop:
         - ensures venv
@@ -43,6 +233,11 @@ class DevOpsEngineerAgent(BaseAgent):
         - runs backend checks
         - on failure, asks LLM for patches and applies them
         - retries up to max_iterations
+
+        Subprocesses run on the event loop. When the previous iteration
+        failed at install, a repair request for the same failure is sent
+        speculatively while pip runs, and only used if pip fails again with
+        the same error lines.
         """
         backend_root = ensure_dir(self.project_root / "project_state" / "codebase" / "backend")
         devops_dir = ensure_dir(self.project_root / "project_state" / "devops")
@@ -66,58 +261,123 @@ class DevOpsEngineerAgent(BaseAgent):
         raw_backend_path = self.project_root / "project_state" / "codebase" / "backend_generation.txt"
         raw_backend = raw_backend_path.read_text() if raw_backend_path.exists() else ""
 
-        for iteration in range(1, self.cfg.max_iterations + 1):
-            self.logger.info("DevOps iteration %d/%d", iteration, self.cfg.max_iterations)
-
-            # ⏱️ Throttle between iterations to avoid hammering Gemini
-            if iteration > 1 and self.cfg.sleep_between_iterations > 0:
-                self.logger.info(
-                    "Sleeping %d seconds before starting iteration %d",
-                    self.cfg.sleep_between_iterations,
-                    iteration,
-                )
-                time.sleep(self.cfg.sleep_between_iterations)
-
-            # 1) Install deps
-            install_ok, install_log = self._install_dependencies(backend_root, venv_dir)
-            (devops_dir / f"install_{iteration}.log").write_text(install_log)
-
-            if not install_ok:
-                self.logger.warning("Install failed on iteration %d, attempting repair.", iteration)
-                self._attempt_repair(
-                    backend_root=backend_root,
-                    devops_dir=devops_dir,
-                    iteration=iteration,
-                    phase="install",
-                    logs=install_log,
-                    spec_text=spec_text,
-                    arch_text=arch_text,
-                    raw_backend=raw_backend,
-                )
-                # go to next iteration AFTER repair
-                continue
-
-            # 2) Run checks (structure + import + optional uvicorn)
-            checks_ok, checks_log = self._run_backend_checks(backend_root, venv_dir)
-            (devops_dir / f"checks_{iteration}.log").write_text(checks_log)
-
-            if checks_ok:
-                self.logger.info("DevOps checks passed on iteration %d", iteration)
-                (devops_dir / "status.txt").write_text(f"SUCCESS on iteration {iteration}\n")
-                return state
-
-            self.logger.warning("DevOps checks failed on iteration %d, attempting repair.", iteration)
-            self._attempt_repair(
-                backend_root=backend_root,
-                devops_dir=devops_dir,
-                iteration=iteration,
-                phase="checks",
-                logs=checks_log,
-                spec_text=spec_text,
-                arch_text=arch_text,
-                raw_backend=raw_backend,
-            )
-            # loop continues; next iteration will re-install / re-check
+        loop = asyncio.get_running_loop()
+        # Dedicated pool so an abandoned speculative call never blocks loop shutdown.
+        spec_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="devops-speculative")
+        prev_install_log: Optional[str] = None
+        prev_install_errors = ""
+        retry_after: Optional[float] = None
+
+        try:
+            for iteration in range(1, self.cfg.max_iterations + 1):
+                # Per-iteration artifacts (logs, raw patches, status) are flushed together.
+                writer = BulkWriter()
+                spec_cancel = threading.Event()
+                try:
+                    self.logger.info("DevOps iteration %d/%d", iteration, self.cfg.max_iterations)
+
+                    # Back off only if the last LLM call was rate-limited / overloaded.
+                    if retry_after:
+                        self.logger.info(
+                            "Provider asked to back off; sleeping %.1f seconds before iteration %d",
+                            retry_after,
+                            iteration,
+                        )
+                        await asyncio.sleep(retry_after)
+                    retry_after = None
+
+                    # The tree only changes when a patch is applied, so list it once per iteration.
+                    backend_tree = self._backend_tree(backend_root)
+
+                    # Anticipate a repeat install failure: warm the repair call while pip runs.
+                    speculative: Optional[asyncio.Future] = None
+                    # Only worth it when pip named its errors; otherwise a repeat can't be recognized.
+                    if self.cfg.speculative_repair and prev_install_log is not None and prev_install_errors:
+                        spec_prompt = self._build_repair_prompt(
+                            backend_root=backend_root,
+                            iteration=iteration,
+                            phase="install",
+                            logs=prev_install_log,
+                            backend_tree=backend_tree,
+                            raw_backend=raw_backend,
+                        )
+                        speculative = loop.run_in_executor(
+                            spec_pool,
+                            self._fetch_candidates,
+                            self._repair_requests(spec_prompt, spec_text, arch_text),
+                            spec_cancel,
+                        )
+
+                    # 1) Install deps
+                    install_ok, install_log = await self._install_dependencies(backend_root, venv_dir)
+                    writer.add(devops_dir / f"install_{iteration}.log", install_log)
+
+                    prefetched: Optional[List[str]] = None
+                    if speculative is not None:
+                        if not install_ok and _pip_errors(install_log) == prev_install_errors:
+                            try:
+                                prefetched = await speculative
+                                self.logger.info("Using speculative repair for repeated install failure.")
+                            except Exception as exc:  # noqa: BLE001
+                                self.logger.warning("Speculative repair call failed: %s", exc)
+                        else:
+                            # Future.cancel() can't stop a running executor call;
+                            # the event makes its candidate streams stop early.
+                            spec_cancel.set()
+                            speculative.cancel()
+
+                    if not install_ok:
+                        prev_install_log = install_log
+                        prev_install_errors = _pip_errors(install_log)
+                        self.logger.warning("Install failed on iteration %d, attempting repair.", iteration)
+                        retry_after = await asyncio.to_thread(
+                            self._attempt_repair,
+                            backend_root=backend_root,
+                            devops_dir=devops_dir,
+                            iteration=iteration,
+                            phase="install",
+                            logs=install_log,
+                            backend_tree=backend_tree,
+                            spec_text=spec_text,
+                            arch_text=arch_text,
+                            raw_backend=raw_backend,
+                            prefetched=prefetched,
+                            writer=writer,
+                        )
+                        # go to next iteration AFTER repair
+                        continue
+                    prev_install_log = None
+
+                    # 2) Run checks (structure + import + optional uvicorn)
+                    checks_ok, checks_log = await self._run_backend_checks(backend_root, venv_dir)
+                    writer.add(devops_dir / f"checks_{iteration}.log", checks_log)
+
+                    if checks_ok:
+                        self.logger.info("DevOps checks passed on iteration %d", iteration)
+                        writer.add(devops_dir / "status.txt", f"SUCCESS on iteration {iteration}\n")
+                        return state
+
+                    self.logger.warning("DevOps checks failed on iteration %d, attempting repair.", iteration)
+                    retry_after = await asyncio.to_thread(
+                        self._attempt_repair,
+                        backend_root=backend_root,
+                        devops_dir=devops_dir,
+                        iteration=iteration,
+                        phase="checks",
+                        logs=checks_log,
+                        backend_tree=backend_tree,
+                        spec_text=spec_text,
+                        arch_text=arch_text,
+                        raw_backend=raw_backend,
+                        writer=writer,
+                    )
+                    # loop continues; next iteration will re-install / re-check
+                finally:
+                    # Never leave a speculative call streaming past its iteration.
+                    spec_cancel.set()
+                    writer.flush()
+        finally:
+            spec_pool.shutdown(wait=False, cancel_futures=True)
 
         # If we exit the loop, all attempts failed
         self.logger.error("DevOps failed after %d iterations.", self.cfg.max_iterations)
@@ -127,139 +387,200 @@ class DevOpsEngineerAgent(BaseAgent):
 
     # ---------- helpers ----------
 
-    def _install_dependencies(self, backend_root: Path, venv_dir: Path) -> tuple[bool, str]:
-        req_file = backend_root / "requirements.txt"
-        lines: List[str] = []
-
-        def run_cmd(cmd: List[str], cwd: Path) -> int:
-            proc = subprocess.Popen(
-                cmd,
-                cwd=str(cwd),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            stdout, _ = proc.communicate()
-            lines.append(f"$ {' '.join(cmd)}\n{stdout}\n")
-            return proc.returncode
-
-        # create venv if needed
-        if not venv_dir.exists():
-            code = run_cmd([sys.executable, "-m", "venv", str(venv_dir)], backend_root)
-            if code != 0:
-                return False, "".join(lines)
-
-        python_bin = venv_dir / "bin" / "python"
-        pip_bin = venv_dir / "bin" / "pip"
-        if sys.platform.startswith("win"):
-            python_bin = venv_dir / "Scripts" / "python.exe"
-            pip_bin = venv_dir / "Scripts" / "pip.exe"
-
-        # install dependencies
-        if req_file.exists():
-            code = run_cmd([str(pip_bin), "install", "-r", str(req_file)], backend_root)
-            return code == 0, "".join(lines)
-        else:
-            lines.append("No requirements.txt found; skipping pip install.\n")
-            return True, "".join(lines)
+    def _list_backend(self, root: Path) -> str:
+        """
+        Walk the backend tree once with os.scandir and return the prompt-ready
+        tree string ("[D] rel" / "[F] rel" lines, sorted).
+        The venv and bytecode caches are listed but not descended into.
+        """
+        mtime = root.stat().st_mtime_ns
+        cached = self._tree_cache.get(root)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        tree_lines: List[str] = []
+
+        def walk(directory: Path, prefix: str) -> None:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+            for entry in entries:
+                rel = f"{prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    tree_lines.append(f"[D] {rel}")
+                    if entry.name not in _SKIP_DIRS:
+                        walk(directory / entry.name, f"{rel}/")
+                elif entry.name not in _SKIP_FILES:
+                    tree_lines.append(f"[F] {rel}")
 
-        lines: List[str] = []
+        walk(root, "")
+        tree_str = "\n".join(tree_lines)
+        self._tree_cache[root] = (mtime, tree_str)
+        return tree_str
 
-        def run_cmd(cmd: List[str]) -> int:
-            proc = subprocess.Popen(
-                cmd,
-                cwd=str(backend_root),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
+    @staticmethod
+    async def _run_cmd(
+        cmd: List[str], cwd: Path, lines: List[str], env: Optional[Dict[str, str]] = None
+    ) -> int:
+        """
+        Run `cmd` without blocking the event loop, appending its output to `lines`.
+        stdout and stderr are captured on separate pipes (1 MiB where the OS
+        allows it) and concatenated afterwards.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(cwd),
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **_PIPE_KWARGS,
+        )
+        stdout, stderr = await proc.communicate()
+        out = stdout.decode(errors="replace")
+        if stderr:
+            out = f"{out}\n{stderr.decode(errors='replace')}"
+        lines.append(f"$ {' '.join(cmd)}\n{out}\n")
+        return proc.returncode if proc.returncode is not None else -1
+
+    def _pip_env(self) -> Dict[str, str]:
+        """
+        Environment for pip: a cache shared by every generated project, plus
+        the local wheelhouse as extra find-links when one has been populated.
+        """
+        env = dict(os.environ)
+        env.setdefault("PIP_CACHE_DIR", str(self.cfg.pip_cache_dir))
+        wheelhouse = Path(self.cfg.wheelhouse_dir)
+        if "PIP_FIND_LINKS" not in env and wheelhouse.is_dir():
+            env["PIP_FIND_LINKS"] = str(wheelhouse)
+        return env
+
+    async def _ensure_template_venv(self, cwd: Path, lines: List[str]) -> Optional[Path]:
+        """
+        Return the template venv, building it once (venv + template_packages)
+        if it doesn't exist yet. Built in a temp dir and renamed into place so
+        concurrent runs never see a half-built template. None if unavailable.
+        """
+        template = self.cfg.template_venv_dir
+        if template is None:
+            return None
+        template = Path(template)
+        if template.is_dir():
+            return template
+
+        self.logger.info("Building template venv at %s", template)
+        tmp = template.with_name(f"{template.name}.{os.getpid()}.tmp")
+        template.parent.mkdir(parents=True, exist_ok=True)
+        shutil.rmtree(tmp, ignore_errors=True)
+        code = await self._run_cmd([sys.executable, "-m", "venv", str(tmp)], cwd, lines)
+        if code == 0 and self.cfg.template_packages:
+            code = await self._run_cmd(
+                [str(_venv_python(tmp)), "-m", "pip", "install", "--prefer-binary", *self.cfg.template_packages],
+                cwd,
+                lines,
+                env=self._pip_env(),
             )
-            stdout, _ = proc.communicate()
-            lines.append(f"$ {' '.join(cmd)}\n{stdout}\n")
-            return proc.returncode
-
-        python_bin = venv_dir / "bin" / "python"
-        if sys.platform.startswith("win"):
-            python_bin = venv_dir / "Scripts" / "python.exe"
-
-        # 🔴 NEW: structural checks
-        py_files = list(backend_root.rglob("*.py"))
-        if not py_files:
-            lines.append("No Python source files found in backend; backend not generated.\n")
-            return False, "".join(lines)
+        if code != 0:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return None
+        try:
+            tmp.rename(template)
+        except OSError:
+            # Another run won the race; use its template.
+            shutil.rmtree(tmp, ignore_errors=True)
+        return template if template.is_dir() else None
 
-        required = ["run_backend.py", "app/main.py", "check_backend.py"]
-        missing = [p for p in required if not (backend_root / p).exists()]
-        if missing:
-            lines.append(f"Missing required files: {', '.join(missing)}\n")
-            return False, "".join(lines)
+    async def _clone_template_venv(self, venv_dir: Path, cwd: Path, lines: List[str]) -> bool:
+        """
+        Clone the template venv into `venv_dir`: `cp -a --reflink=auto` on Linux
+        (copy-on-write on btrfs/xfs), otherwise a hardlinked copytree.
+        Returns False if there is no template or cloning failed.
+        """
+        template = await self._ensure_template_venv(cwd, lines)
+        if template is None:
+            return False
 
-        ok = True
+        if sys.platform.startswith("linux") and shutil.which("cp"):
+            code = await self._run_cmd(["cp", "-a", "--reflink=auto", str(template), str(venv_dir)], cwd, lines)
+            if code == 0:
+                return True
+            shutil.rmtree(venv_dir, ignore_errors=True)
 
-        # 1) import check
-        check_script = backend_root / "check_backend.py"
-        if self.cfg.run_import_check and check_script.exists():
-            code = run_cmd([str(python_bin), str(check_script)])
-            ok = ok and (code == 0)
+        try:
+            await asyncio.to_thread(shutil.copytree, template, venv_dir, symlinks=True, copy_function=os.link)
+            return True
+        except OSError as exc:
+            # e.g. template on another filesystem: fall back to a fresh venv
+            lines.append(f"Hardlink clone of template venv failed: {exc}\n")
+            shutil.rmtree(venv_dir, ignore_errors=True)
+            return False
+
+    async def _ensure_venv(self, backend_root: Path, venv_dir: Path, lines: List[str]) -> bool:
+        """Create the venv if needed: clone the template, else a fresh venv."""
+        if venv_dir.exists() or await self._clone_template_venv(venv_dir, backend_root, lines):
+            return True
+        code = await self._run_cmd([sys.executable, "-m", "venv", str(venv_dir)], backend_root, lines)
+        return code == 0
+
+    async def _install_dependencies(self, backend_root: Path, venv_dir: Path) -> tuple[bool, str]:
+        req_file = backend_root / "requirements.txt"
+        lines: List[str] = []
 
-        # 2) (optional uvicorn dry-run later)
+        if not await self._ensure_venv(backend_root, venv_dir, lines):
+            return False, "".join(lines)
+
+        python_bin = _venv_python(venv_dir)
 
-        return ok, "".join(lines)
+        # install dependencies (only what the template doesn't already have).
+        # `python -m pip` rather than bin/pip: a cloned venv's scripts still
+        # carry the template's interpreter in their shebang.
+        if req_file.exists():
+            code = await self._run_cmd(
+                [str(python_bin), "-m", "pip", "install", "--prefer-binary", "-r", str(req_file)],
+                backend_root,
+                lines,
+                env=self._pip_env(),
+            )
+            return code == 0, "".join(lines)
+        else:
+            lines.append("No requirements.txt found; skipping pip install.\n")
+            return True, "".join(lines)
 
+    def _backend_tree(self, backend_root: Path) -> str:
+        """Tree summary for repair prompts; empty if the tree can't be listed."""
+        try:
+            return self._list_backend(backend_root)
+        except Exception as e:
+            # If the tree fails for some reason, still proceed with what we have
+            self.logger.warning("Failed to build backend tree for DevOps repair: %s", e)
+            return ""
 
-    def _attempt_repair(
+    def _build_repair_prompt(
         self,
         backend_root: Path,
-        devops_dir: Path,
         iteration: int,
         phase: str,
         logs: str,
-        spec_text: str = "",
-        arch_text: str = "",
+        backend_tree: str,
         raw_backend: str = "",
-    ) -> None:
+    ) -> str:
         """
-        Ask the LLM to generate a FILE_BUNDLE patch to fix the backend.
-        This must NEVER crash the overall orchestration.
+        Build the per-iteration user prompt asking for a FILE_BUNDLE patch.
+        `backend_tree` is the precomputed tree string for this iteration.
+        The spec and architecture travel separately as committed context.
         """
 
-        # Build file tree summary BEFORE calling the LLM
-        tree_lines = []
-        try:
-            for path in sorted(backend_root.rglob("*")):
-                rel = path.relative_to(backend_root)
-                if path.is_dir():
-                    tree_lines.append(f"[D] {rel}")
-                else:
-                    tree_lines.append(f"[F] {rel}")
-        except Exception as e:
-            # If the tree fails for some reason, still proceed with what we have
-            self.logger.warning(
-                "Failed to build backend tree for DevOps repair: %s", e
-            )
-        backend_tree = "\n".join(tree_lines)
-
         # Full user prompt with context
         user_prompt = f"""
 You are the DevOps / platform engineer in an autonomous software engineering team.
 
-We have a generated Python backend project that is currently failing DevOps checks.
+We have a generated Python backend project (spec and architecture above) that is
+currently failing DevOps checks.
 
 Phase: {phase}  (either "install" or "checks")
 Iteration: {iteration}
 
-CLARIFIED SPEC:
----------------- SPEC START ----------------
-{spec_text}
----------------- SPEC END ------------------
-
-ARCHITECTURE:
----------------- ARCH START ----------------
-{arch_text}
----------------- ARCH END ------------------
-
 RAW BACKEND GENERATION (may be prose or partial code; treat as hints only):
 ---------------- BACKEND GEN START ---------
-{raw_backend[:8000]}
+{_relevant_raw_backend(raw_backend, logs, backend_tree)}
 ---------------- BACKEND GEN END -----------
 
 Current backend project tree (relative to backend/):
@@ -316,24 +637,110 @@ Rules:
 - Include ONLY files under backend/.
 - Do NOT include any explanations or commentary outside the FILE_MAP and FILE_START/FILE_END blocks.
 """
+        return user_prompt
 
-        # 1) Call LLM to get a FILE_BUNDLE patch
-        try:
-            patch_text = self._call_llm(
-                system_prompt=self._system_prompt,
-                user_prompt=user_prompt,
+    def _repair_requests(self, user_prompt: str, spec_text: str, arch_text: str) -> List[LLMRequest]:
+        """
+        One request per configured temperature, so a single batch yields N drafts.
+        The spec and architecture are committed context: byte-identical on every
+        iteration, so they stay inside the provider's cached prefix.
+        """
+        committed = [
+            {
+                "role": "user",
+                "content": (
+                    "CLARIFIED SPEC:\n"
+                    "---------------- SPEC START ----------------\n"
+                    f"{spec_text}\n"
+                    "---------------- SPEC END ------------------\n\n"
+                    "ARCHITECTURE:\n"
+                    "---------------- ARCH START ----------------\n"
+                    f"{arch_text}\n"
+                    "---------------- ARCH END ------------------\n"
+                ),
+            }
+        ]
+        return [
+            LLMRequest(
+                static_system=self._system_prompt,
+                committed=committed,
+                recent=[{"role": "user", "content": user_prompt}],
                 role="devops",
+                temperature=temperature,
             )
+            for temperature in self.cfg.repair_temperatures
+        ]
+
+    def _fetch_candidates(self, reqs: List[LLMRequest], cancel: Optional[threading.Event] = None) -> List[str]:
+        """
+        Stream all candidate patches concurrently, cutting each stream off as
+        soon as its FILE_BUNDLE is complete. Raises only if every candidate failed.
+        Setting `cancel` abandons the call: candidates not yet started are
+        skipped and running streams are closed at their next chunk.
+        """
+
+        def fetch(req: LLMRequest) -> str:
+            if cancel is None:
+                return read_until_bundle_complete(self._call_llm_stream(req))
+            if cancel.is_set():
+                return ""
+            return read_until_bundle_complete(_until_set(self._call_llm_stream(req), cancel))
+
+        results: List[str] = []
+        last_error: Exception | None = None
+        with ThreadPoolExecutor(max_workers=len(reqs), thread_name_prefix="devops-candidate") as pool:
+            futures = [pool.submit(fetch, req) for req in reqs]
+            for fut in futures:
+                try:
+                    results.append(fut.result())
+                except Exception as exc:  # noqa: BLE001
+                    last_error = exc
+                    results.append("")
+
+        if last_error is not None and not any(results):
+            raise last_error
+        return results
+
+    def _attempt_repair(
+        self,
+        backend_root: Path,
+        devops_dir: Path,
+        iteration: int,
+        phase: str,
+        logs: str,
+        backend_tree: str,
+        writer: BulkWriter,
+        spec_text: str = "",
+        arch_text: str = "",
+        raw_backend: str = "",
+        prefetched: Optional[List[str]] = None,
+    ) -> Optional[float]:
+        """
+        Ask the LLM to generate a FILE_BUNDLE patch to fix the backend.
+        `prefetched` carries candidates from a speculative call for this exact failure.
+        Debug artifacts are buffered in `writer`, which the caller flushes.
+        Returns a back-off delay in seconds if the LLM was rate-limited, else None.
+        This must NEVER crash the overall orchestration.
+        """
+        user_prompt = self._build_repair_prompt(
+            backend_root=backend_root,
+            iteration=iteration,
+            phase=phase,
+            logs=logs,
+            backend_tree=backend_tree,
+            raw_backend=raw_backend,
+        )
+
+        # 1) Call LLM for several candidate FILE_BUNDLE patches concurrently
+        reqs = self._repair_requests(user_prompt, spec_text, arch_text)
+        try:
+            candidates = prefetched if prefetched is not None else self._fetch_candidates(reqs)
         except Exception as exc:
             # Very important: do NOT crash the orchestrator on quota/overload/etc.
-            error_path = devops_dir / f"patch_error_{phase}_{iteration}.log"
-            try:
-                error_path.write_text(
-                    f"DevOps LLM call failed during phase='{phase}' on iteration {iteration}:\n{exc}\n"
-                )
-            except Exception:
-                # best-effort logging
-                pass
+            writer.add(
+                devops_dir / f"patch_error_{phase}_{iteration}.log",
+                f"DevOps LLM call failed during phase='{phase}' on iteration {iteration}:\n{exc}\n",
+            )
             self.logger.error(
                 "DevOps LLM call failed during phase='%s' iteration %d; "
                 "skipping further repair this iteration: %s",
@@ -341,78 +748,96 @@ Rules:
                 iteration,
                 exc,
             )
-            return
+            if isinstance(exc, TransientLLMError):
+                return exc.retry_after if exc.retry_after is not None else float(self.cfg.transient_retry_delay)
+            return None
 
         # Always save the raw patch text for debugging
-        try:
-            (devops_dir / f"patch_raw_{phase}_{iteration}.txt").write_text(patch_text)
-        except Exception:
-            pass
-
-        # 2) Parse FILE_BUNDLE
-        try:
-            bundle = parse_file_bundle(patch_text)
-        except FileBundleParseError as e:
-            invalid_path = devops_dir / f"invalid_patch_{phase}_{iteration}.txt"
+        raw_dump = "\n".join(
+            f"===== CANDIDATE {idx} (temperature={req.temperature}) =====\n{text}"
+            for idx, (req, text) in enumerate(zip(reqs, candidates))
+        )
+        writer.add(devops_dir / f"patch_raw_{phase}_{iteration}.txt", raw_dump)
+
+        # 2) Parse FILE_BUNDLE: take the first candidate that parses
+        bundle = None
+        errors: List[str] = []
+        for idx, patch_text in enumerate(candidates):
             try:
-                invalid_path.write_text(patch_text)
-            except Exception:
-                pass
+                bundle = parse_file_bundle(patch_text)
+                self.logger.info("Using DevOps patch candidate %d of %d", idx, len(candidates))
+                break
+            except FileBundleParseError as e:
+                errors.append(f"candidate {idx}: {e}")
+
+        if bundle is None:
+            writer.add(devops_dir / f"invalid_patch_{phase}_{iteration}.txt", raw_dump)
             self.logger.error(
                 "DevOps patch was not in valid FILE_BUNDLE format during phase='%s' "
                 "on iteration %d: %s",
                 phase,
                 iteration,
-                e,
+                "; ".join(errors),
             )
-            return
-    def _run_backend_checks(self, backend_root: Path, venv_dir: Path) -> tuple[bool, str]:
+            return None
+
+        # 3) Apply the patch. Paths are relative to backend/, but tolerate
+        #    a leading "backend/" since the user prompt examples use it.
+        files: Dict[str, bytes] = {}
+        for rel_path, content in bundle.files:
+            rel_path = rel_path.lstrip("/").replace("\\", "/")
+            if rel_path.startswith("backend/"):
+                rel_path = rel_path[len("backend/"):]
+            files[rel_path] = content
+        try:
+            written = write_file_bundle(FileBundle(files=list(files.items())), backend_root)
+            self.logger.info("Applied DevOps patch: %d file(s) written", len(written))
+        except OSError as e:
+            self.logger.error("Failed to apply DevOps patch on iteration %d: %s", iteration, e)
+        finally:
+            # This is the tree cache's real invalidation: patched files are
+            # usually nested, which leaves the root mtime it checks unchanged.
+            self._tree_cache.pop(backend_root, None)
+        return None
+
+    async def _run_backend_checks(self, backend_root: Path, venv_dir: Path) -> tuple[bool, str]:
         """
         DevOps validation step:
         1) ensure backend exists structurally
         2) import check via check_backend.py
         3) REAL runtime check: run `python run_backend.py --check`
+        Steps 2 and 3 share one venv interpreter via a transient harness script.
         """
 
         lines: List[str] = []
 
-        def run_cmd(cmd: List[str]) -> int:
-            proc = subprocess.Popen(
-                cmd,
-                cwd=str(backend_root),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            stdout, _ = proc.communicate()
-            lines.append(f"$ {' '.join(cmd)}\n{stdout}\n")
-            return proc.returncode
-
-        python_bin = venv_dir / ("Scripts/python.exe" if sys.platform.startswith("win") else "bin/python")
+        python_bin = _venv_python(venv_dir)
 
         # --- Structural checks ---
-        py_files = list(backend_root.rglob("*.py"))
-        if not py_files:
+        required = ["run_backend.py", "app/main.py", "check_backend.py"]
+        has_py, missing_set = _has_any_py_and_required(backend_root, required)
+        if not has_py:
             return False, "No Python source files found in backend.\n"
 
-        required = ["run_backend.py", "app/main.py", "check_backend.py"]
-        missing = [p for p in required if not (backend_root / p).exists()]
+        missing = [p for p in required if p in missing_set]
         if missing:
             return False, f"Missing required files: {', '.join(missing)}\n"
 
-        ok = True
-
-        # --- 1) Import check ---
-        check_script = backend_root / "check_backend.py"
-        if self.cfg.run_import_check and check_script.exists():
-            import_code = run_cmd([str(python_bin), str(check_script)])
-            ok = ok and (import_code == 0)
-
-        # --- 2) Runtime startup check ---
+        # --- Import check + runtime startup check, in a single interpreter ---
+        steps: List[Tuple[str, List[str]]] = []
+        if self.cfg.run_import_check and (backend_root / "check_backend.py").exists():
+            steps.append(("", ["check_backend.py"]))
         if self.cfg.run_uvicorn_check:
-            lines.append("=== Running backend startup check ===\n")
-            run_code = run_cmd([str(python_bin), "run_backend.py", "--check"])
-            ok = ok and (run_code == 0)
+            steps.append(("=== Running backend startup check ===", ["run_backend.py", "--check"]))
+        if not steps:
+            return True, ""
+
+        harness = backend_root / _HARNESS_NAME
+        harness.write_text(_HARNESS_SRC.format(steps=steps))
+        try:
+            code = await self._run_cmd([str(python_bin), _HARNESS_NAME], backend_root, lines)
+        finally:
+            harness.unlink(missing_ok=True)
 
-        return ok, "".join(lines)
+        return code == 0, "".join(lines)
 
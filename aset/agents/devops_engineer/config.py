@@ -1,6 +1,11 @@
 # aset/config/devops_config.py
 
+import sys
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+_ASET_CACHE = Path.home() / ".cache" / "aset"
 
 @dataclass
 class DevOpsRepairConfig:
@@ -8,5 +13,12 @@ class DevOpsRepairConfig:
     reinstall_on_change: bool = True
     run_import_check: bool = True
     run_uvicorn_check: bool = False  # optional later
-    sleep_between_iterations: int = 15   # <-- new (seconds)
-    transient_retry_delay: int = 10      # <-- optional retry if 503/429
+    transient_retry_delay: int = 10      # wait after a 429/503 when the server sends no Retry-After
+    speculative_repair: bool = True      # warm the repair call while pip re-runs after an install failure
+    repair_temperatures: Tuple[float, ...] = (0.2, 0.5, 0.8)  # one candidate patch per temperature
+    pip_cache_dir: Path = _ASET_CACHE / "pip"    # shared across generated projects
+    wheelhouse_dir: Path = _ASET_CACHE / "wheels"  # used as --find-links if it exists (e.g. filled by `pip download`)
+    # Prebuilt venv cloned into each backend instead of `python -m venv` + a cold install.
+    # Set to None to always create a fresh venv.
+    template_venv_dir: Optional[Path] = _ASET_CACHE / f"template_venv-py{sys.version_info[0]}.{sys.version_info[1]}"
+    template_packages: Tuple[str, ...] = ("fastapi", "sqlmodel", "uvicorn", "pydantic")
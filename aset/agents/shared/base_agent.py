@@ -1,21 +1,45 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
 
+from aset.llm.cache.semantic_cache import SemanticCache
 from aset.llm.router.llm_router import LLMRouter, LLMRequest
+from aset.utils import json_utils
 from aset.utils.logger import get_logger
 
 
+def _default_cache_dir() -> Optional[Path]:
+    """
+    Directory for cached LLM responses.
+    Set ASET_LLM_CACHE_DIR to override, or to an empty string to disable caching.
+    """
+    raw = os.getenv("ASET_LLM_CACHE_DIR")
+    if raw is None:
+        return Path.home() / ".cache" / "aset" / "llm"
+    return Path(raw).expanduser() if raw else None
+
+
 class BaseAgent(ABC):
     """
     Base class for all agents.
     Provides access to the LLM router and a logger.
     """
 
+    # Cached responses older than this are ignored (and overwritten).
+    CACHE_TTL_SECONDS = 7 * 24 * 3600
+
     def __init__(self, llm_router: LLMRouter) -> None:
         self.llm = llm_router
         self.logger = get_logger(self.__class__.__name__)
+        # One cache layer: a router with its own response cache already
+        # covers every call, so the agent-side cache is switched off.
+        self.cache_dir = _default_cache_dir() if llm_router.cache is None else None
+        self.semantic_cache = SemanticCache.from_env(self.cache_dir)
 
     @abstractmethod
     def run(self, **kwargs: Any) -> Any:
@@ -35,6 +59,12 @@ class BaseAgent(ABC):
             _call_llm(system_prompt="...", user_prompt="...", role="planning")
         - Old style (used by BackendEngineerAgent, etc.):
             _call_llm(req: LLMRequest)
+
+        Responses are cached on disk (see ASET_LLM_CACHE_DIR), keyed on the
+        request and the router's provider/model chain for its role, so
+        identical requests on reruns skip the provider round-trip. With
+        ASET_SEMANTIC_CACHE=1, near-duplicate prompts are served as well.
+        Both are skipped when the router has its own response cache.
         """
         # Old style: _call_llm(req)
         if isinstance(system_prompt, LLMRequest):
@@ -47,11 +77,125 @@ class BaseAgent(ABC):
                     "with (system_prompt: str, user_prompt: str, role: str)."
                 )
 
-            messages: List[Dict[str, str]] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
-            req = LLMRequest(messages=messages, role=role)  # type: ignore[arg-type]
+            req = LLMRequest(
+                static_system=system_prompt,
+                recent=[{"role": "user", "content": user_prompt}],
+                role=role,  # type: ignore[arg-type]
+            )
+
+        key = self._cache_key(req)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.logger.info("LLM cache hit for role=%s (%s)", req.role, key[:12])
+            return cached
+
+        cached = self._semantic_get(req)
+        if cached is not None:
+            self.logger.info("LLM semantic cache hit for role=%s", req.role)
+            return cached
 
         self.logger.info("Calling LLM with role=%s", req.role)
-        return self.llm.call(req)
+        result = self.llm.call(req)
+        self._cache_put(key, req, result)
+        self._semantic_put(key, req, result)
+        return result
+
+    def _call_llm_stream(self, req: LLMRequest) -> Iterator[str]:
+        """
+        Streaming variant of `_call_llm`. A cache hit is yielded as a single
+        chunk; a fresh response is cached only if the caller consumed it fully.
+        """
+        key = self._cache_key(req)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.logger.info("LLM cache hit for role=%s (%s)", req.role, key[:12])
+            yield cached
+            return
+
+        self.logger.info("Streaming LLM with role=%s", req.role)
+        parts: List[str] = []
+        for chunk in self.llm.stream(req):
+            parts.append(chunk)
+            yield chunk
+        self._cache_put(key, req, "".join(parts))
+
+    def _call_llm_batch(self, reqs: List[LLMRequest]) -> List[str]:
+        """
+        Batched variant of `_call_llm`: cached requests are answered locally,
+        the rest go to the router in a single `call_batch`.
+        """
+        keys = [self._cache_key(r) for r in reqs]
+        results: List[Optional[str]] = [self._cache_get(k) for k in keys]
+        pending = [i for i, r in enumerate(results) if r is None]
+
+        if pending:
+            self.logger.info(
+                "Calling LLM batch with role=%s (%d of %d uncached)",
+                reqs[0].role,
+                len(pending),
+                len(reqs),
+            )
+            fresh = self.llm.call_batch([reqs[i] for i in pending])
+            for i, text in zip(pending, fresh):
+                results[i] = text
+                self._cache_put(keys[i], reqs[i], text)
+
+        return [r or "" for r in results]
+
+    # ---------- response cache ----------
+
+    def _cache_scope(self, req: LLMRequest) -> str:
+        """Role plus the providers/models that would answer it; part of every cache key."""
+        return self.llm.cache_scope(req.role)
+
+    def _cache_key(self, req: LLMRequest) -> str:
+        key_data: Dict[str, Any] = {"scope": self._cache_scope(req), "messages": req.messages}
+        if req.temperature is not None:
+            key_data["temperature"] = req.temperature
+        return hashlib.sha256(json_utils.dumps(key_data, sort_keys=True)).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self.CACHE_TTL_SECONDS:
+                return None
+            return json_utils.loads(path.read_bytes())["response"]
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # noqa: BLE001
+            # A corrupt entry is just a miss; it will be overwritten below.
+            self.logger.warning("Ignoring unreadable LLM cache entry %s: %s", path, exc)
+            return None
+
+    def _cache_put(self, key: str, req: LLMRequest, result: str) -> None:
+        # An empty response is a failed call, not an answer worth replaying.
+        if self.cache_dir is None or not result.strip():
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{key}.json"
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(json_utils.dumps({"role": req.role, "response": result}))
+            tmp.replace(path)
+        except OSError as exc:
+            # Caching is best-effort; never fail the agent because of it.
+            self.logger.warning("Failed to write LLM cache entry: %s", exc)
+
+    def _semantic_get(self, req: LLMRequest) -> Optional[str]:
+        if self.semantic_cache is None:
+            return None
+        try:
+            return self.semantic_cache.get(self._cache_scope(req), req.messages)
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("Semantic cache lookup failed: %s", exc)
+            return None
+
+    def _semantic_put(self, key: str, req: LLMRequest, result: str) -> None:
+        if self.semantic_cache is None or not result.strip():
+            return
+        try:
+            self.semantic_cache.put(key, self._cache_scope(req), req.messages, result)
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("Failed to add semantic cache entry: %s", exc)
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=None)
+def load_prompt(path: str) -> str:
+    """
+    Read an agent's prompt.md once per process; agents may be re-created per request.
+    """
+    return Path(path).read_text()
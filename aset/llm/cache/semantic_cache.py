@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _messages_to_text(messages: List[Dict[str, str]]) -> str:
+    return "\n\n".join(f"{m.get('role', 'user').upper()}:\n{m.get('content', '')}" for m in messages)
+
+
+class SemanticCache:
+    """
+    Near-duplicate response cache backed by a local chromadb collection.
+
+    Prompts are embedded with a small sentence-transformer model
+    (all-MiniLM-L6-v2); a lookup returns the stored response when the
+    closest cached prompt for the same role is within `threshold` cosine
+    similarity.
+
+    Config (env):
+      - ASET_SEMANTIC_CACHE=1 enables the cache (off by default)
+      - ASET_SEMANTIC_THRESHOLD (default: 0.97)
+    """
+
+    COLLECTION = "llm_responses"
+    MODEL_NAME = "all-MiniLM-L6-v2"
+
+    def __init__(self, persist_dir: Path, threshold: float = 0.97) -> None:
+        # Heavy optional dependencies; only imported when the cache is enabled.
+        import chromadb
+        from chromadb.utils import embedding_functions
+
+        self.threshold = threshold
+        persist_dir.mkdir(parents=True, exist_ok=True)
+        self._client = chromadb.PersistentClient(path=str(persist_dir))
+        self._collection = self._client.get_or_create_collection(
+            name=self.COLLECTION,
+            embedding_function=embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=self.MODEL_NAME
+            ),
+            metadata={"hnsw:space": "cosine"},
+        )
+
+    @classmethod
+    def from_env(cls, cache_dir: Optional[Path]) -> Optional["SemanticCache"]:
+        """
+        Build the cache if ASET_SEMANTIC_CACHE=1, otherwise return None.
+        Missing dependencies disable the cache instead of failing the agent.
+        """
+        if os.getenv("ASET_SEMANTIC_CACHE") != "1" or cache_dir is None:
+            return None
+        threshold = float(os.getenv("ASET_SEMANTIC_THRESHOLD", "0.97"))
+        try:
+            return cls(cache_dir / "semantic", threshold=threshold)
+        except ImportError as exc:
+            logger.warning("Semantic cache disabled; missing dependency: %s", exc)
+            return None
+
+    def get(self, role: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        if self._collection.count() == 0:
+            return None
+
+        res = self._collection.query(
+            query_texts=[_messages_to_text(messages)],
+            n_results=1,
+            where={"role": role},
+        )
+        distances = (res.get("distances") or [[]])[0]
+        metadatas = (res.get("metadatas") or [[]])[0]
+        if not distances or not metadatas:
+            return None
+
+        # chromadb reports cosine *distance* (1 - similarity).
+        if distances[0] < 1.0 - self.threshold:
+            meta: Dict[str, Any] = metadatas[0] or {}
+            return meta.get("response")
+        return None
+
+    def put(self, key: str, role: str, messages: List[Dict[str, str]], response: str) -> None:
+        self._collection.upsert(
+            ids=[key],
+            documents=[_messages_to_text(messages)],
+            metadatas=[{"role": role, "response": response}],
+        )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sys
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+# HTTP statuses that mean "try again later" rather than "this request is wrong".
+TRANSIENT_STATUS_CODES = frozenset({429, 503})
+
+
+class TransientLLMError(RuntimeError):
+    """
+    Raised when a provider is rate-limited or temporarily unavailable.
+    `retry_after` is the server-suggested delay in seconds, if it sent one.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date) or a
+    google.rpc RetryInfo delay such as "37s". Returns seconds or None.
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text.endswith("s"):
+        text = text[:-1]
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_outage(exc: BaseException) -> bool:
+    """
+    True for errors that say the provider is unavailable (rate limits,
+    overload, connection failures and timeouts), as opposed to errors
+    caused by the request itself (e.g. a 400 for a bad prompt).
+    """
+    if isinstance(exc, (TransientLLMError, ConnectionError, TimeoutError)):
+        return True
+    # httpx is imported lazily by the HTTP providers; only check it if loaded.
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(exc, httpx.TransportError)
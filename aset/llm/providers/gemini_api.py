@@ -1,35 +1,233 @@
+import asyncio
+import hashlib
+import logging
 import os
-from typing import Dict, List
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from aset.llm.errors import TRANSIENT_STATUS_CODES, TransientLLMError, parse_retry_after
+from aset.llm.providers.streaming import coalesce
+
+logger = logging.getLogger(__name__)
+
+
+_prefix_locks: Dict[str, threading.Lock] = {}
+_prefix_locks_guard = threading.Lock()
+
+
+def _prefix_lock(key: str) -> threading.Lock:
+    """One lock per cached-prefix key, shared by every provider in the process."""
+    with _prefix_locks_guard:
+        return _prefix_locks.setdefault(key, threading.Lock())
+
+
+def _too_small_to_cache(exc: Exception) -> bool:
+    # The API rejects prompts under its minimum token count with a 400
+    # ("Cached content is too small ... min_total_token_count ...").
+    return (
+        isinstance(exc, genai_errors.APIError)
+        and getattr(exc, "code", None) == 400
+        and "too small" in str(exc).lower()
+    )
 
 
 class GeminiProvider:
     """
     Gemini Developer API via Google Gen AI SDK (google-genai).
     Uses GEMINI_API_KEY.
+
+    The leading system message is sent as a system instruction and, when it
+    is large enough for the API to accept it, uploaded once as cached
+    content so repeated calls only pay for the cached prefix.
     """
 
-    def __init__(self, model: str = "gemini-2.5-flash"):
+    CACHE_TTL_SECONDS = 3600
+
+    def __init__(
+        self,
+        model: str = "gemini-2.5-flash",
+        prefix_cache: Optional[Dict[str, Tuple[Optional[str], float]]] = None,
+        client: Optional[genai.Client] = None,
+    ):
+        # A client may be shared by several providers that differ only in model.
+        self.client = client if client is not None else self.create_client()
+        self.model = model
+        # "model:blake2b(system_text)" -> (cached content name or None, expiry monotonic time).
+        # LLMRouter passes one dict to all its Gemini providers.
+        self._prefix_caches = prefix_cache if prefix_cache is not None else {}
+
+    @staticmethod
+    def create_client() -> genai.Client:
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY environment variable not set")
 
         # This client uses the Gemini Developer API when given an API key.
-        self.client = genai.Client(api_key=api_key)
-        self.model = model
+        return genai.Client(api_key=api_key)
 
-    def chat(self, messages: List[Dict[str, str]]) -> str:
-        # Flatten role-based messages into a single prompt.
-        parts = []
+    @staticmethod
+    def _to_contents(messages: List[Dict[str, str]]) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Split OpenAI-style messages into (system_text, contents).
+        Leading system messages become the system instruction, up to and
+        including one marked with `cache_control`; any later ones are passed
+        through as user turns so per-call notes never change the cached prefix.
+        """
+        system_parts: List[str] = []
+        contents: List[Dict[str, Any]] = []
+        prefix_closed = False
         for m in messages:
-            role = m.get("role", "user").upper()
+            role = m.get("role", "user")
             content = m.get("content", "")
-            parts.append(f"{role}:\n{content}")
-        prompt = "\n\n".join(parts)
+            if role == "system" and not contents and not prefix_closed:
+                system_parts.append(content)
+                prefix_closed = "cache_control" in m
+                continue
+            gemini_role = "model" if role == "assistant" else "user"
+            contents.append({"role": gemini_role, "parts": [{"text": content}]})
+        return "\n\n".join(system_parts), contents
+
+    def _cached_prefix(self, system_text: str) -> Optional[str]:
+        """
+        Return a cached-content handle for `system_text`, creating it on first use.
+        Creation is serialized per prefix, so concurrent candidates share one
+        cache instead of each paying for their own. Prompts below the API's
+        minimum cacheable size are remembered as uncacheable so we don't retry
+        on every call; other failures are retried on the next call.
+        """
+        digest = hashlib.blake2b(system_text.encode("utf-8"), digest_size=16).hexdigest()
+        key = f"{self.model}:{digest}"
+        entry = self._prefix_caches.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        with _prefix_lock(key):
+            now = time.monotonic()
+            entry = self._prefix_caches.get(key)
+            if entry is not None and entry[1] > now:
+                return entry[0]  # created while we waited
+
+            try:
+                cache = self.client.caches.create(
+                    model=self.model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=system_text,
+                        ttl=f"{self.CACHE_TTL_SECONDS}s",
+                    ),
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.info("GeminiProvider: system prompt not cached (%s)", exc)
+                if _too_small_to_cache(exc):
+                    self._prefix_caches[key] = (None, now + self.CACHE_TTL_SECONDS - 60)
+                return None
+
+            # Refresh a little before the server-side TTL runs out.
+            self._prefix_caches[key] = (cache.name, now + self.CACHE_TTL_SECONDS - 60)
+            return cache.name
+
+    def _config(self, system_text: str, temperature: Optional[float]) -> Optional[types.GenerateContentConfig]:
+        kwargs: Dict[str, Any] = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if system_text:
+            cached = self._cached_prefix(system_text)
+            if cached:
+                kwargs["cached_content"] = cached
+            else:
+                kwargs["system_instruction"] = system_text
+        return types.GenerateContentConfig(**kwargs) if kwargs else None
+
+    @staticmethod
+    def _retry_after(exc: genai_errors.APIError) -> Optional[float]:
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        delay = parse_retry_after(headers.get("retry-after"))
+        if delay is not None:
+            return delay
+        # 429 bodies carry a google.rpc.RetryInfo detail, e.g. {"retryDelay": "37s"}.
+        details = getattr(exc, "details", None) or {}
+        if isinstance(details, dict):
+            for item in (details.get("error") or {}).get("details") or []:
+                if isinstance(item, dict) and "retryDelay" in item:
+                    return parse_retry_after(item["retryDelay"])
+        return None
+
+    def _raise_transient(self, exc: genai_errors.APIError) -> None:
+        """Re-raise 429/503 as TransientLLMError; leave other API errors alone."""
+        if getattr(exc, "code", None) in TRANSIENT_STATUS_CODES:
+            raise TransientLLMError(
+                f"Gemini[{self.model}] temporarily unavailable: {exc}",
+                retry_after=self._retry_after(exc),
+            ) from exc
+
+    def _log_usage(self, resp: Any) -> None:
+        usage = getattr(resp, "usage_metadata", None)
+        if usage is not None:
+            logger.info(
+                "GeminiProvider[%s]: prompt_tokens=%s cached_tokens=%s",
+                self.model,
+                getattr(usage, "prompt_token_count", None),
+                getattr(usage, "cached_content_token_count", None),
+            )
+
+    def chat(self, messages: List[Dict[str, str]], temperature: Optional[float] = None) -> str:
+        system_text, contents = self._to_contents(messages)
+        try:
+            resp = self.client.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=self._config(system_text, temperature),
+            )
+        except genai_errors.APIError as exc:
+            self._raise_transient(exc)
+            raise
+        self._log_usage(resp)
+        return resp.text or ""
+
+    def chat_stream(self, messages: List[Dict[str, str]], temperature: Optional[float] = None) -> Iterator[str]:
+        """
+        Stream the response as text chunks (coalesced to ~100ms / 200 chars).
+        """
+        system_text, contents = self._to_contents(messages)
+
+        def deltas() -> Iterator[str]:
+            last = None
+            try:
+                for chunk in self.client.models.generate_content_stream(
+                    model=self.model,
+                    contents=contents,
+                    config=self._config(system_text, temperature),
+                ):
+                    last = chunk
+                    yield chunk.text or ""
+            except genai_errors.APIError as exc:
+                self._raise_transient(exc)
+                raise
+            if last is not None:
+                self._log_usage(last)
+
+        yield from coalesce(deltas())
 
-        resp = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-        )
+    async def achat(self, messages: List[Dict[str, str]], temperature: Optional[float] = None) -> str:
+        """
+        Async `chat` via the SDK's aio client, which keeps its own connection pool.
+        """
+        system_text, contents = self._to_contents(messages)
+        # Creating the cached prefix is a blocking call; keep it off the event loop.
+        config = await asyncio.to_thread(self._config, system_text, temperature)
+        try:
+            resp = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=config,
+            )
+        except genai_errors.APIError as exc:
+            self._raise_transient(exc)
+            raise
+        self._log_usage(resp)
         return resp.text or ""
@@ -1,8 +1,13 @@
+import json
 import os
 import logging
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from aset.llm.errors import TRANSIENT_STATUS_CODES, TransientLLMError, parse_retry_after
+from aset.llm.providers.streaming import coalesce
 
 logger = logging.getLogger(__name__)
 
@@ -16,31 +21,89 @@ class LocalLLMProvider:
       - LOCAL_LLM_MODEL (default: llama3.1:8b)
     """
 
-    def __init__(self, model: str | None = None, url: str | None = None, name: str = "local"):
+    # LLMRouter passes its pooled httpx.AsyncClient to `achat`.
+    uses_http_client = True
+
+    def __init__(
+        self,
+        model: str | None = None,
+        url: str | None = None,
+        name: str = "local",
+        http_client: Any = None,
+    ):
         self.name = name
         self.url = url or os.getenv("LOCAL_LLM_URL", "http://localhost:11434/api/chat")
         self.model = model or os.getenv("LOCAL_LLM_MODEL", "llama3.1:8b")
 
-    def chat(self, messages: List[Dict[str, str]]) -> str:
-        """
-        Call a local LLM (Ollama-style /api/chat endpoint) with an OpenAI-like messages list.
-        """
+        # Sync calls go through `http_client` (a pooled httpx.Client shared by the
+        # router) when given; otherwise through a private keep-alive session.
+        self._http = http_client
+        self._session: requests.Session | None = None
+        if http_client is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+
+    def _raise_for_status(self, resp: Any) -> None:
+        """raise_for_status, but 429/503 (model busy / loading) become TransientLLMError."""
+        if resp.status_code in TRANSIENT_STATUS_CODES:
+            raise TransientLLMError(
+                f"LocalLLMProvider[{self.name}] returned HTTP {resp.status_code}",
+                retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+            )
+        resp.raise_for_status()
+
+    def _payload(self, messages: List[Dict[str, str]], temperature: float | None, stream: bool) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "model": self.model,
-            "messages": messages,
-            "stream": False,
+            # Ollama only understands role/content; drop markers such as cache_control.
+            "messages": [{"role": m["role"], "content": m["content"]} for m in messages],
+            "stream": stream,
         }
+        if temperature is not None:
+            payload["options"] = {"temperature": temperature}
+        return payload
+
+    def chat(self, messages: List[Dict[str, str]], temperature: float | None = None) -> str:
+        """
+        Call a local LLM (Ollama-style /api/chat endpoint) with an OpenAI-like messages list.
+        """
+        payload = self._payload(messages, temperature, stream=False)
 
         logger.info("LocalLLMProvider[%s]: calling %s model=%s", self.name, self.url, self.model)
         try:
-            resp = requests.post(self.url, json=payload, timeout=600)
-            resp.raise_for_status()
+            resp = (self._http or self._session).post(self.url, json=payload, timeout=600)
+            self._raise_for_status(resp)
         except Exception as exc:
             logger.error("LocalLLMProvider[%s] request failed: %s", self.name, exc)
             raise
 
-        data = resp.json()
+        return self._extract_content(resp.json())
+
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float | None = None,
+        *,
+        client: Any,
+    ) -> str:
+        """
+        Async `chat` over a shared `httpx.AsyncClient` (keep-alive pool owned by the router).
+        """
+        payload = self._payload(messages, temperature, stream=False)
 
+        logger.info("LocalLLMProvider[%s]: calling %s model=%s (async)", self.name, self.url, self.model)
+        try:
+            resp = await client.post(self.url, json=payload, timeout=600)
+            self._raise_for_status(resp)
+        except Exception as exc:
+            logger.error("LocalLLMProvider[%s] request failed: %s", self.name, exc)
+            raise
+
+        return self._extract_content(resp.json())
+
+    def _extract_content(self, data: Any) -> str:
         # Ollama /api/chat format: { "message": {"role": "...", "content": "..."}, "done": true }
         if isinstance(data, dict) and "message" in data:
             msg = data["message"]
@@ -55,3 +118,30 @@ class LocalLLMProvider:
 
         logger.error("LocalLLMProvider[%s]: unexpected response format: %s", self.name, data)
         raise RuntimeError("Unexpected local LLM response format")
+
+    def _open_stream(self, payload: Dict[str, Any]) -> Any:
+        if self._http is not None:
+            return self._http.stream("POST", self.url, json=payload, timeout=600)
+        return self._session.post(self.url, json=payload, timeout=600, stream=True)
+
+    def chat_stream(self, messages: List[Dict[str, str]], temperature: float | None = None) -> Iterator[str]:
+        """
+        Streaming variant of `chat`: parses Ollama's NDJSON stream and yields text chunks.
+        """
+        payload = self._payload(messages, temperature, stream=True)
+
+        logger.info("LocalLLMProvider[%s]: streaming %s model=%s", self.name, self.url, self.model)
+        with self._open_stream(payload) as resp:
+            self._raise_for_status(resp)
+
+            def deltas() -> Iterator[str]:
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    msg = data.get("message") or {}
+                    yield msg.get("content", "")
+                    if data.get("done"):
+                        break
+
+            yield from coalesce(deltas())
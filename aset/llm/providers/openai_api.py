@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import openai  # you'll need `openai` in requirements
 
+from aset.llm.providers.streaming import coalesce
+
 
 class OpenAIProvider:
     """
@@ -20,13 +22,32 @@ class OpenAIProvider:
         openai.api_key = api_key
         self.default_model = default_model
 
+    @staticmethod
+    def _system_first(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        # Keep system messages at the very front so the request prefix is
+        # byte-stable across calls and OpenAI's automatic prefix caching applies.
+        # Only role/content are sent; OpenAI rejects extra keys like cache_control.
+        plain = [{"role": m["role"], "content": m["content"]} for m in messages]
+        return [m for m in plain if m["role"] == "system"] + [m for m in plain if m["role"] != "system"]
+
     def chat(self, messages: List[Dict[str, str]], model: Optional[str] = None, **kwargs: Any) -> str:
         model = model or self.default_model
 
         # NOTE: adjust to the exact SDK version you're using
         completion = openai.ChatCompletion.create(
             model=model,
-            messages=messages,
+            messages=self._system_first(messages),
             **kwargs,
         )
         return completion.choices[0].message["content"]
+
+    def chat_stream(self, messages: List[Dict[str, str]], model: Optional[str] = None, **kwargs: Any) -> Iterator[str]:
+        model = model or self.default_model
+
+        chunks = openai.ChatCompletion.create(
+            model=model,
+            messages=self._system_first(messages),
+            stream=True,
+            **kwargs,
+        )
+        yield from coalesce(c.choices[0].delta.get("content", "") for c in chunks)
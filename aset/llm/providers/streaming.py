@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable, Iterator, List
+
+
+def coalesce(deltas: Iterable[str], interval: float = 0.1, min_chars: int = 200) -> Iterator[str]:
+    """
+    Re-chunk a stream of small text deltas: yield once `min_chars` have
+    accumulated or `interval` seconds passed since the last yield, so
+    consumers aren't woken for every token.
+    """
+    buf: List[str] = []
+    size = 0
+    last = time.monotonic()
+    for delta in deltas:
+        if not delta:
+            continue
+        buf.append(delta)
+        size += len(delta)
+        now = time.monotonic()
+        if size >= min_chars or now - last >= interval:
+            yield "".join(buf)
+            buf.clear()
+            size = 0
+            last = now
+    if buf:
+        yield "".join(buf)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from aset.utils import json_utils
+
+logger = logging.getLogger(__name__)
+
+
+def _request_text(req: Any) -> str:
+    return "\n\n".join(f"{m.get('role', 'user').upper()}:\n{m.get('content', '')}" for m in req.messages)
+
+
+class RouterResponseCache:
+    """
+    Response cache in front of LLMRouter.
+
+    Every entry is scoped by the router to the request's role and its
+    provider/model chain, so rewiring a role or changing a model misses.
+
+    - Exact path: sha256 of (scope, messages, temperature) -> response, in sqlite.
+    - Semantic path (optional): prompts embedded with all-MiniLM-L6-v2 into a
+      FAISS inner-product index; a cached response for the same scope and
+      temperature is reused when cosine similarity >= `threshold`.
+      Needs faiss + sentence-transformers; without them only exact hits apply.
+
+    Entries expire after `ttl_seconds` (24h by default).
+    """
+
+    MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+    TTL_SECONDS = 24 * 3600
+
+    def __init__(
+        self,
+        path: Path,
+        threshold: float = 0.9,
+        ttl_seconds: float = TTL_SECONDS,
+        semantic: bool = True,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scoped_responses ("
+            " key TEXT PRIMARY KEY, scope TEXT, temperature REAL,"
+            " response TEXT, embedding BLOB, created REAL)"
+        )
+        self._db.execute("DELETE FROM scoped_responses WHERE created < ?", (time.time() - ttl_seconds,))
+        self._db.commit()
+
+        self._model: Any = None
+        self._index: Any = None
+        self._index_keys: List[str] = []
+        if semantic:
+            self._init_semantic()
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return Path.home() / ".cache" / "aset" / "router_cache.sqlite"
+
+    def _init_semantic(self) -> None:
+        try:
+            import faiss
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            logger.warning("RouterResponseCache: semantic lookups disabled; missing dependency: %s", exc)
+            return
+
+        self._np = np
+        self._model = SentenceTransformer(self.MODEL_NAME)
+        self._index = faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension())
+        rows = self._db.execute("SELECT key, embedding FROM scoped_responses WHERE embedding IS NOT NULL").fetchall()
+        if rows:
+            self._index.add(np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows]))
+            self._index_keys = [key for key, _ in rows]
+
+    @staticmethod
+    def key(req: Any, scope: str) -> str:
+        data = {"scope": scope, "messages": req.messages, "temperature": req.temperature}
+        return hashlib.sha256(json_utils.dumps(data, sort_keys=True)).hexdigest()
+
+    def _embed(self, req: Any) -> Any:
+        vec = self._model.encode([_request_text(req)], normalize_embeddings=True)
+        return self._np.asarray(vec, dtype=self._np.float32)
+
+    def _fresh_row(self, key: str) -> Optional[Tuple[str, Optional[float], str]]:
+        row = self._db.execute(
+            "SELECT scope, temperature, response FROM scoped_responses WHERE key = ? AND created >= ?",
+            (key, time.time() - self.ttl_seconds),
+        ).fetchone()
+        return row
+
+    def get(self, req: Any, scope: str) -> Optional[str]:
+        key = self.key(req, scope)
+        with self._lock:
+            row = self._fresh_row(key)
+        if row is not None:
+            return row[2]
+
+        if self._index is None or not self._index_keys:
+            return None
+        vec = self._embed(req)
+        with self._lock:
+            scores, ids = self._index.search(vec, min(5, len(self._index_keys)))
+            for score, idx in zip(scores[0], ids[0]):
+                if idx < 0 or score < self.threshold:
+                    break
+                row = self._fresh_row(self._index_keys[idx])
+                if row is not None and row[0] == scope and row[1] == req.temperature:
+                    logger.info("RouterResponseCache: semantic hit (similarity %.3f)", score)
+                    return row[2]
+        return None
+
+    def put(self, req: Any, scope: str, response: str) -> None:
+        if not response.strip():
+            # An empty response is a failed call, not an answer worth replaying.
+            return
+        key = self.key(req, scope)
+        vec = self._embed(req) if self._index is not None else None
+        with self._lock:
+            is_new = self._db.execute("SELECT 1 FROM scoped_responses WHERE key = ?", (key,)).fetchone() is None
+            self._db.execute(
+                "INSERT OR REPLACE INTO scoped_responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, scope, req.temperature, response, None if vec is None else vec[0].tobytes(), time.time()),
+            )
+            self._db.commit()
+            if vec is not None and is_new:
+                self._index.add(vec)
+                self._index_keys.append(key)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,22 +1,90 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import importlib.util
 import logging
 import os
-from dataclasses import dataclass
-from typing import List, Dict, Any, Literal
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Awaitable, Dict, Iterator, List, Literal, Optional, Tuple, TypeVar
 
+from aset.llm.errors import TransientLLMError, is_outage
 from aset.llm.providers.gemini_api import GeminiProvider
 from aset.llm.providers.local_llm_api import LocalLLMProvider
+from aset.llm.router.cache import RouterResponseCache
 
 logger = logging.getLogger(__name__)
 
 LLMRole = Literal["planning", "code_gen", "devops"]
 
+T = TypeVar("T")
+
+
+Msg = Dict[str, Any]
+
+# Marks the end of the stable, cacheable prefix (Anthropic-style); providers
+# that don't understand it strip it before sending.
+CACHE_CONTROL = {"type": "ephemeral"}
+
 
 @dataclass
 class LLMRequest:
-    messages: List[Dict[str, str]]
+    """
+    A prompt split by how often each part changes, most stable first:
+    - static_system: the agent's instructions (identical across calls)
+    - committed:     context fixed for the whole run (spec, architecture, ...)
+    - dynamic:       per-call context, sent as a system note
+    - recent:        the latest turn(s)
+    `messages` concatenates them in that order so the shared prefix stays
+    byte-identical between calls and provider prefix caches can hit.
+    """
+
+    static_system: str = ""
+    committed: List[Msg] = field(default_factory=list)
+    dynamic: str = ""
+    recent: List[Msg] = field(default_factory=list)
     role: LLMRole = "code_gen"
+    temperature: Optional[float] = None
+
+    @property
+    def messages(self) -> List[Msg]:
+        msgs: List[Msg] = []
+        if self.static_system:
+            msgs.append({"role": "system", "content": self.static_system, "cache_control": CACHE_CONTROL})
+        msgs.extend(self.committed)
+        if self.dynamic:
+            msgs.append({"role": "system", "content": self.dynamic})
+        msgs.extend(self.recent)
+        return msgs
+
+
+@dataclass
+class Breaker:
+    """
+    Per-provider circuit breaker: while open, the provider is skipped.
+    Updated from concurrent candidate threads, so updates take a lock.
+    """
+
+    open_until: float = 0.0
+    consecutive_fail: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_fail += 1
+            self.open_until = time.monotonic() + min(30, 2 ** self.consecutive_fail) + random.random()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.open_until = 0.0
+            self.consecutive_fail = 0
 
 
 class LLMRouter:
@@ -24,63 +92,280 @@ class LLMRouter:
     Simple multi-provider router:
     - Chooses provider chain based on `role`
     - Tries providers in order, falling back on exceptions
+
+    Calls run as coroutines on a private event-loop thread that owns a
+    pooled keep-alive `httpx.AsyncClient`, so connections are reused across
+    calls and `acall_many` fans requests out concurrently. `call` is a
+    blocking wrapper for synchronous callers. Synchronous provider traffic
+    (streaming) shares one pooled `httpx.Client`.
+
+    An optional `RouterResponseCache` answers repeated / near-duplicate requests
+    before any provider is tried.
+
+    Transient errors (429/503) are retried on the same provider with
+    exponential backoff and jitter; a provider that keeps failing has its
+    `Breaker` opened and is skipped until it cools down.
     """
 
-    def __init__(self) -> None:
-        # Read config from env (optional)
+    # Wiring: which providers (attribute names) to try for each role, in order
+    _ROLE_PROVIDERS: Dict[str, Tuple[str, ...]] = {
+        # Prefer cloud for planning/spec, but fall back to local if quota hit / offline
+        "planning": (
+            "_gemini_planning",
+            #"_local_planning",
+        ),
+        # Code generation: default to local model to avoid quotas
+        "code_gen": (
+            #"_local_code",
+            "_gemini_planning",  # optional fallback if you want
+        ),
+        # DevOps: local only by default (can be very chatty)
+        "devops": (
+            #"_local_devops",
+            "_gemini_devops",  # optional fallback if needed
+        ),
+    }
+
+    # Provider attribute -> attribute holding its model name.
+    _PROVIDER_MODELS: Dict[str, str] = {
+        "_gemini_planning": "_planning_model",
+        "_gemini_code": "_code_model",
+        "_gemini_devops": "_devops_model",
+        "_local_planning": "_local_planner_model",
+        "_local_code": "_local_code_model",
+        "_local_devops": "_local_devops_model",
+    }
+
+    # Retries of one provider on TransientLLMError (attempts, first delay, max delay).
+    RETRY_ATTEMPTS = 3
+    RETRY_INITIAL_DELAY = 0.2
+    RETRY_MAX_DELAY = 5.0
+
+    def __init__(self, cache: Optional[RouterResponseCache] = None) -> None:
+        self.cache = cache
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._http: Any = None  # httpx.AsyncClient, created on the loop thread
+        # Gemini cached-content handles, shared by all Gemini providers:
+        # "model:blake2b(static_system)" -> (cache name or None, expiry)
+        self._gemini_prefixes: Dict[str, Tuple[Optional[str], float]] = {}
+        # provider attribute (e.g. "_gemini_devops") -> Breaker; filled lazily from candidate worker threads
+        self._breakers: Dict[str, Breaker] = {}
+        self._breakers_lock = threading.Lock()
+
+        # Read config from env (optional); providers are only built on first use.
         #gemini_model = os.getenv("GEMINI_MODEL_PLANNING", "gemini-2.0-flash")
-        planning_model = os.getenv("GEMINI_MODEL_PLANNING", "gemini-2.5-pro")
-        code_model = os.getenv("GEMINI_MODEL_CODE", "gemini-2.5-pro")
-        devops_model = os.getenv("GEMINI_MODEL_DEVOPS", "gemini-2.5-pro")
-        # Gemini providers
-        self._gemini_planning = GeminiProvider(model=planning_model)
-        self._gemini_code = GeminiProvider(model=code_model)
-        self._gemini_devops = GeminiProvider(model=devops_model)
+        self._planning_model = os.getenv("GEMINI_MODEL_PLANNING", "gemini-2.5-pro")
+        self._code_model = os.getenv("GEMINI_MODEL_CODE", "gemini-2.5-pro")
+        self._devops_model = os.getenv("GEMINI_MODEL_DEVOPS", "gemini-2.5-pro")
 
         # Optional: local fallback
-        local_planner_model = os.getenv("LOCAL_LLM_MODEL_PLANNING", "llama3.1:8b")
-        local_code_model = os.getenv("LOCAL_LLM_MODEL_CODE", "qwen2.5-coder:7b")
-        local_devops_model = os.getenv("LOCAL_LLM_MODEL_DEVOPS", "llama3.1:8b")
-
-        self._local_planning = LocalLLMProvider(model=local_planner_model, name="local-planning")
-        self._local_code = LocalLLMProvider(model=local_code_model, name="local-code")
-        self._local_devops = LocalLLMProvider(model=local_devops_model, name="local-devops")
-
-        # Wiring: which providers to try for each role, in order
-        self.providers_by_role: dict[LLMRole, list[Any]] = {
-            # Prefer cloud for planning/spec, but fall back to local if quota hit / offline
-            "planning": [
-                self._gemini_planning,
-                #self._local_planning,
-            ],
-            # Code generation: default to local model to avoid quotas
-            "code_gen": [
-                #self._local_code,
-                self._gemini_planning,  # optional fallback if you want
-            ],
-            # DevOps: local only by default (can be very chatty)
-            "devops": [
-                #self._local_devops,
-                self._gemini_devops,  # optional fallback if needed
-            ],
-        }
+        self._local_planner_model = os.getenv("LOCAL_LLM_MODEL_PLANNING", "llama3.1:8b")
+        self._local_code_model = os.getenv("LOCAL_LLM_MODEL_CODE", "qwen2.5-coder:7b")
+        self._local_devops_model = os.getenv("LOCAL_LLM_MODEL_DEVOPS", "llama3.1:8b")
 
-    def call(self, req: LLMRequest) -> str:
-        role: LLMRole = req.role
-        providers = self.providers_by_role.get(role, [])
+    # ---------- providers (lazy) ----------
+
+    @cached_property
+    def _gemini_client(self) -> Any:
+        # One client (auth + HTTP stack) for all Gemini models.
+        return GeminiProvider.create_client()
+
+    def _gemini(self, model: str) -> GeminiProvider:
+        return GeminiProvider(model=model, prefix_cache=self._gemini_prefixes, client=self._gemini_client)
+
+    @cached_property
+    def _gemini_planning(self) -> GeminiProvider:
+        return self._gemini(self._planning_model)
+
+    @cached_property
+    def _gemini_code(self) -> GeminiProvider:
+        return self._gemini(self._code_model)
+
+    @cached_property
+    def _gemini_devops(self) -> GeminiProvider:
+        return self._gemini(self._devops_model)
+
+    @cached_property
+    def _local_planning(self) -> LocalLLMProvider:
+        return LocalLLMProvider(model=self._local_planner_model, name="local-planning", http_client=self._sync_http)
+
+    @cached_property
+    def _local_code(self) -> LocalLLMProvider:
+        return LocalLLMProvider(model=self._local_code_model, name="local-code", http_client=self._sync_http)
+
+    @cached_property
+    def _local_devops(self) -> LocalLLMProvider:
+        return LocalLLMProvider(model=self._local_devops_model, name="local-devops", http_client=self._sync_http)
+
+    def providers_by_role(self, role: LLMRole) -> Iterator[Any]:
+        """Yield the providers for `role` in fallback order, building each on first use."""
+        for attr in self._ROLE_PROVIDERS.get(role, ()):
+            yield getattr(self, attr)
+
+    def provider_chain(self, role: LLMRole) -> Tuple[str, ...]:
+        """
+        "provider:model" for each provider tried for `role`, in order, without
+        building any of them. Changes whenever the role's wiring or models do.
+        """
+        return tuple(
+            f"{attr.lstrip('_')}:{getattr(self, self._PROVIDER_MODELS[attr])}"
+            for attr in self._ROLE_PROVIDERS.get(role, ())
+        )
+
+    def cache_scope(self, role: LLMRole) -> str:
+        """Role plus its provider chain; cached responses are only reused within one scope."""
+        return "|".join((role, *self.provider_chain(role)))
+
+    def _breaker(self, attr: str) -> Breaker:
+        """Breaker for the provider attribute `attr`; doesn't build the provider."""
+        breaker = self._breakers.get(attr)
+        if breaker is None:
+            # Locked so two threads can't each create (and count into) their own Breaker.
+            with self._breakers_lock:
+                breaker = self._breakers.setdefault(attr, Breaker())
+        return breaker
+
+    def _retry_delay(self, attempt: int, exc: TransientLLMError) -> Optional[float]:
+        """Delay before retry `attempt` (1-based), or None to give up on this provider."""
+        if attempt >= self.RETRY_ATTEMPTS:
+            return None
+        if exc.retry_after is not None:
+            # A long server-requested wait is left to the caller (and the breaker).
+            return exc.retry_after if exc.retry_after <= self.RETRY_MAX_DELAY else None
+        delay = min(self.RETRY_MAX_DELAY, self.RETRY_INITIAL_DELAY * 2 ** (attempt - 1))
+        return delay + random.uniform(0, delay)
+
+    def _all_open(self, role: LLMRole) -> TransientLLMError:
+        wait = min(self._breaker(attr).open_until for attr in self._ROLE_PROVIDERS[role]) - time.monotonic()
+        return TransientLLMError(
+            f"All LLM providers for role={role} are cooling down after failures",
+            retry_after=max(0.0, wait),
+        )
+
+    @staticmethod
+    def _all_failed(role: LLMRole, last_error: Exception | None) -> RuntimeError:
+        # Keep the transient type (and its retry hint) so callers can back off instead of failing.
+        message = f"All LLM providers failed for role={role}: {last_error}"
+        if isinstance(last_error, TransientLLMError):
+            return TransientLLMError(message, retry_after=last_error.retry_after)
+        return RuntimeError(message)
+
+    @staticmethod
+    def _chat_one(provider: Any, req: LLMRequest) -> str:
+        if req.temperature is not None:
+            return provider.chat(req.messages, temperature=req.temperature)
+        return provider.chat(req.messages)
+
+    # ---------- event loop / HTTP pool ----------
 
-        if not providers:
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-router-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _http_client(self) -> Any:
+        """Shared keep-alive client; only touched from the router loop."""
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60),
+                # HTTP/2 needs the optional `h2` package.
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=600,
+            )
+        return self._http
+
+    @cached_property
+    def _sync_http(self) -> Any:
+        """Shared keep-alive client for synchronous provider calls (e.g. streaming)."""
+        import httpx
+
+        client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(600, connect=5),
+        )
+        atexit.register(client.close)
+        return client
+
+    async def _on_loop(self, coro: Awaitable[T]) -> T:
+        # Provider clients are bound to the router loop; hop onto it if awaited from elsewhere.
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the loop thread."""
+        if "_sync_http" in self.__dict__:
+            self._sync_http.close()
+        loop = self._loop
+        if loop is None:
+            return
+        if self._http is not None:
+            self._run(self._http.aclose())
+            self._http = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop = None
+
+    # ---------- calls ----------
+
+    async def _achat_one(self, provider: Any, req: LLMRequest) -> str:
+        if not hasattr(provider, "achat"):
+            return await asyncio.to_thread(self._chat_one, provider, req)
+        kwargs: Dict[str, Any] = {"temperature": req.temperature} if req.temperature is not None else {}
+        if getattr(provider, "uses_http_client", False):
+            kwargs["client"] = self._http_client()
+        return await provider.achat(req.messages, **kwargs)
+
+    async def _acall(self, req: LLMRequest) -> str:
+        if self.cache is not None:
+            hit = await asyncio.to_thread(self.cache.get, req, self.cache_scope(req.role))
+            if hit is not None:
+                logger.info("LLMRouter: role=%s served from response cache", req.role)
+                return hit
+        result = await self._acall_providers(req)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, req, self.cache_scope(req.role), result)
+        return result
+
+    async def _acall_providers(self, req: LLMRequest) -> str:
+        role: LLMRole = req.role
+        if not self._ROLE_PROVIDERS.get(role):
             raise RuntimeError(f"No LLM providers configured for role: {role}")
 
         last_error: Exception | None = None
 
-        for idx, provider in enumerate(providers):
-            provider_name = getattr(provider, "name", provider.__class__.__name__)
+        for idx, attr in enumerate(self._ROLE_PROVIDERS[role]):
+            provider_name = attr.lstrip("_")
+            breaker = self._breaker(attr)
+            if breaker.is_open():
+                logger.info("LLMRouter: role=%s skipping provider[%d]=%s (breaker open)", role, idx, provider_name)
+                continue
             logger.info("LLMRouter: role=%s trying provider[%d]=%s", role, idx, provider_name)
 
             try:
-                return provider.chat(req.messages)
+                # Built inside the try: a failing constructor (e.g. no API key)
+                # falls through to the next provider like any other failure.
+                provider = getattr(self, attr)
+                result = await self._achat_with_retry(provider, req)
             except Exception as exc:  # noqa: BLE001
+                # Only outages open the breaker; a request-specific error
+                # (e.g. a 400) says nothing about the provider's health.
+                if is_outage(exc):
+                    breaker.record_failure()
                 last_error = exc
                 logger.warning(
                     "LLMRouter: provider %s for role=%s failed (%s). Trying next provider if any.",
@@ -89,6 +374,117 @@ class LLMRouter:
                     exc,
                 )
                 continue
+            breaker.record_success()
+            return result
 
+        if last_error is None:
+            raise self._all_open(role)
         # All providers failed
-        raise RuntimeError(f"All LLM providers failed for role={role}: {last_error}")
+        raise self._all_failed(role, last_error) from last_error
+
+    async def _achat_with_retry(self, provider: Any, req: LLMRequest) -> str:
+        attempt = 1
+        while True:
+            try:
+                return await self._achat_one(provider, req)
+            except TransientLLMError as exc:
+                delay = self._retry_delay(attempt, exc)
+                if delay is None:
+                    raise
+                logger.info("LLMRouter: transient error (%s); retrying in %.1fs", exc, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def acall(self, req: LLMRequest) -> str:
+        return await self._on_loop(self._acall(req))
+
+    async def acall_many(self, reqs: List[LLMRequest]) -> List[str]:
+        """Run requests concurrently; results are in the same order as `reqs`."""
+
+        async def gather() -> List[str]:
+            return list(await asyncio.gather(*(self._acall(r) for r in reqs)))
+
+        return await self._on_loop(gather())
+
+    def call(self, req: LLMRequest) -> str:
+        return self._run(self._acall(req))
+
+    def stream(self, req: LLMRequest) -> Iterator[str]:
+        """
+        Streaming variant of `call`. Falls back to the next provider only if
+        a provider fails before yielding anything; providers without
+        `chat_stream` yield their full response as one chunk.
+        """
+        if self.cache is not None:
+            scope = self.cache_scope(req.role)
+            hit = self.cache.get(req, scope)
+            if hit is not None:
+                logger.info("LLMRouter: role=%s served from response cache", req.role)
+                yield hit
+                return
+            parts: List[str] = []
+            for chunk in self._stream_providers(req):
+                parts.append(chunk)
+                yield chunk
+            # Only reached if the caller consumed the whole stream.
+            self.cache.put(req, scope, "".join(parts))
+            return
+        yield from self._stream_providers(req)
+
+    def _stream_providers(self, req: LLMRequest) -> Iterator[str]:
+        role: LLMRole = req.role
+        if not self._ROLE_PROVIDERS.get(role):
+            raise RuntimeError(f"No LLM providers configured for role: {role}")
+
+        last_error: Exception | None = None
+
+        for idx, attr in enumerate(self._ROLE_PROVIDERS[role]):
+            provider_name = attr.lstrip("_")
+            breaker = self._breaker(attr)
+            if breaker.is_open():
+                logger.info("LLMRouter: role=%s skipping provider[%d]=%s (breaker open)", role, idx, provider_name)
+                continue
+            logger.info("LLMRouter: role=%s streaming from provider[%d]=%s", role, idx, provider_name)
+
+            started = False
+            try:
+                provider = getattr(self, attr)
+                if not hasattr(provider, "chat_stream"):
+                    text = self._chat_one(provider, req)
+                    started = True
+                    breaker.record_success()
+                    yield text
+                    return
+                kwargs = {"temperature": req.temperature} if req.temperature is not None else {}
+                for chunk in provider.chat_stream(req.messages, **kwargs):
+                    if not started:
+                        started = True
+                        breaker.record_success()
+                    yield chunk
+                return
+            except Exception as exc:  # noqa: BLE001
+                if started:
+                    raise
+                if is_outage(exc):
+                    breaker.record_failure()
+                last_error = exc
+                logger.warning(
+                    "LLMRouter: provider %s for role=%s failed (%s). Trying next provider if any.",
+                    provider_name,
+                    role,
+                    exc,
+                )
+                continue
+
+        if last_error is None:
+            raise self._all_open(role)
+        raise self._all_failed(role, last_error) from last_error
+
+    def call_batch(self, reqs: List[LLMRequest]) -> List[str]:
+        """
+        Blocking wrapper around `acall_many`: all requests run concurrently
+        (each with its own provider fallback) and results come back in order.
+        """
+        if not reqs:
+            return []
+        return self._run(self.acall_many(reqs))
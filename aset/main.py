@@ -2,6 +2,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import argparse
+import asyncio
 from pathlib import Path
 
 from aset.orchestrator.orchestrator import Orchestrator, OrchestratorConfig
@@ -29,7 +30,7 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    logger = get_logger("main")
+    logger = get_logger("main", skip_process_info=True)
 
     project_root = Path(args.project_dir).resolve()
     logger.info("Using project root: %s", project_root)
@@ -37,7 +38,7 @@ def main() -> None:
     cfg = OrchestratorConfig(project_root=project_root)
     orchestrator = Orchestrator(cfg)
 
-    state = orchestrator.run(user_prompt=args.prompt)
+    state = asyncio.run(orchestrator.run(user_prompt=args.prompt))
     logger.info("Done. Clarified spec:\n%s", state.spec.clarified_spec)
 
 
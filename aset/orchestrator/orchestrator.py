@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -8,6 +9,7 @@ from aset.agents.backend_engineer.agent import BackendEngineerAgent
 from aset.agents.architect.agent import ArchitectAgent
 from aset.agents.devops_engineer.agent import DevOpsEngineerAgent
 from aset.agents.devops_engineer.config import DevOpsRepairConfig
+from aset.llm.router.cache import RouterResponseCache
 from aset.llm.router.llm_router import LLMRouter
 from aset.project_state.state_store import ProjectStateStore, ProjectState
 from aset.utils.file_ops import ensure_dir
@@ -17,6 +19,9 @@ from aset.utils.logger import get_logger
 @dataclass
 class OrchestratorConfig:
     project_root: Path
+    # Router-level response cache (sqlite exact match + optional FAISS near-duplicates).
+    # When on, it replaces the agents' own on-disk cache.
+    response_cache: bool = False
 
 
 class Orchestrator:
@@ -26,13 +31,17 @@ class Orchestrator:
     v1 pipeline:
     1) Product Manager: clarify spec
     2) Architect: design architecture
+    3) Backend engineer: generate code
+    4) DevOps: install, check, repair
+    The DevOps venv is prepared concurrently with phases 2-3.
     (Next steps later: GitHub scout, engineers, QA, critic, etc.)
     """
 
     def __init__(self, cfg: OrchestratorConfig) -> None:
         self.cfg = cfg
         self.logger = get_logger("Orchestrator")
-        self.llm_router = LLMRouter()
+        cache = RouterResponseCache(RouterResponseCache.default_path()) if cfg.response_cache else None
+        self.llm_router = LLMRouter(cache=cache)
 
         self.pm_agent = ProductManagerAgent(
             llm_router=self.llm_router,
@@ -57,30 +66,36 @@ class Orchestrator:
         state_dir = ensure_dir(self.cfg.project_root / "project_state")
         self.state_store = ProjectStateStore(root_dir=state_dir)
 
-    def run(self, user_prompt: str) -> ProjectState:
+    async def run(self, user_prompt: str) -> ProjectState:
         self.logger.info("Starting orchestration for new project.")
 
         # Phase 1: product specification
-        state = self.pm_agent.run(raw_prompt=user_prompt)
+        state = await asyncio.to_thread(self.pm_agent.run, raw_prompt=user_prompt)
+        # A full snapshot starts each run, so nothing from a previous run (e.g. a
+        # stale architecture) survives under this run's deltas.
         self.state_store.save(state)
         self.logger.info("Specification completed and saved.")
 
-        # Phase 2: architecture design
-        state = self.architect_agent.run(state)
-        self.state_store.save(state)
-        self.logger.info("Architecture completed and saved.")
-
-        # Phase 3: backend generation
-        state = self.backend_agent.run(state)
-        self.state_store.save(state)
-        self.logger.info("Backend generation completed and saved.")
+        # Phases 2-3 depend on each other, but not on the DevOps venv; build both at once.
+        state, _ = await asyncio.gather(
+            self._design_and_generate(state),
+            self.devops_agent.prepare(),
+        )
 
         # Phase 4: DevOps repair loop
-        state = self.devops_agent.run(state)
-        self.state_store.save(state)
+        # The backend and DevOps phases write files, not state, so there is no delta to save.
+        state = await self.devops_agent.arun(state)
         self.logger.info("DevOps repair phase completed.")
 
+        return state
 
+    async def _design_and_generate(self, state: ProjectState) -> ProjectState:
+        # Phase 2: architecture design
+        state = await asyncio.to_thread(self.architect_agent.run, state)
+        self.state_store.save_delta("architecture", state.to_dict()["architecture"])
+        self.logger.info("Architecture completed and saved.")
 
-
+        # Phase 3: backend generation
+        state = await asyncio.to_thread(self.backend_agent.run, state)
+        self.logger.info("Backend generation completed.")
         return state
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
-import json
+import os
+import time
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from aset.utils import json_utils
 from aset.utils.file_ops import ensure_dir
 
 
+def _canonical(value: Any) -> Any:
+    """Recursively sort dict keys so equal states serialize to identical bytes."""
+    if isinstance(value, dict):
+        return {k: _canonical(value[k]) for k in sorted(value)}
+    if isinstance(value, list):
+        return [_canonical(v) for v in value]
+    return value
+
+
 @dataclass
 class ProjectSpec:
     raw_prompt: str
@@ -27,7 +38,7 @@ class ProjectState:
     def to_dict(self) -> Dict[str, Any]:
         data: Dict[str, Any] = {"spec": asdict(self.spec)}
         data["architecture"] = asdict(self.architecture) if self.architecture else None
-        return data
+        return _canonical(data)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ProjectState":
@@ -38,14 +49,78 @@ class ProjectState:
 
 
 class ProjectStateStore:
+    """
+    Persists ProjectState as a snapshot (`project_state.json`) plus an
+    append-only log of section deltas (`project_state.jsonl`). `load`
+    replays the log over the snapshot; once the log grows past
+    COMPACT_AFTER entries it is folded back into the snapshot.
+    """
+
+    COMPACT_AFTER = 10
+
     def __init__(self, root_dir: Path) -> None:
         self.root_dir = ensure_dir(root_dir)
         self._state_file = self.root_dir / "project_state.json"
+        self._log_file = self.root_dir / "project_state.jsonl"
+        self._log_entries: Optional[int] = None  # counted lazily
 
     def save(self, state: ProjectState) -> None:
-        self._state_file.write_text(json.dumps(state.to_dict(), indent=2))
+        # Write a temp file and swap it in, so a crash never leaves a truncated state file.
+        tmp = self._state_file.with_suffix(f".json.{os.getpid()}.tmp")
+        tmp.write_bytes(json_utils.dumps(state.to_dict(), sort_keys=True, indent=True))
+        os.replace(tmp, self._state_file)
+        # The snapshot now includes every delta.
+        self._log_file.unlink(missing_ok=True)
+        self._log_entries = 0
+
+    def save_delta(self, section: str, payload: Any) -> None:
+        """Append one changed top-level section (e.g. "spec", "architecture") to the log."""
+        line = json_utils.dumps({"section": section, "ts": time.time(), "data": payload}, sort_keys=True) + b"\n"
+        fd = os.open(self._log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            if self._log_entries is None:
+                self._log_entries = self._recover_log(fd)
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+        self._log_entries += 1
+        if self._log_entries > self.COMPACT_AFTER:
+            self.compact()
+
+    def _recover_log(self, fd: int) -> int:
+        """Count existing entries; terminate a torn final line so the next append stays separate."""
+        raw = self._log_file.read_bytes()
+        if raw and not raw.endswith(b"\n"):
+            os.write(fd, b"\n")
+        return len(self._read_log())
+
+    def compact(self) -> None:
+        """Fold the delta log into a fresh snapshot."""
+        self.save(self.load())
+
+    def _read_log(self) -> List[Dict[str, Any]]:
+        try:
+            raw = self._log_file.read_bytes()
+        except FileNotFoundError:
+            return []
+        entries: List[Dict[str, Any]] = []
+        for line in raw.splitlines():
+            try:
+                entries.append(json_utils.loads(line))
+            except ValueError:
+                # A torn final line from a crash mid-append; everything before it is intact.
+                continue
+        return entries
 
     def load(self) -> ProjectState:
-        if not self._state_file.exists():
+        data: Dict[str, Any] = {}
+        has_snapshot = self._state_file.exists()
+        if has_snapshot:
+            data = json_utils.loads(self._state_file.read_bytes())
+        for entry in self._read_log():
+            data[entry["section"]] = entry["data"]
+        # A log without a snapshot (or one that never recorded a spec) is not a project state.
+        if not has_snapshot or "spec" not in data:
             raise FileNotFoundError(f"No project_state.json in {self.root_dir}")
-        return ProjectState.from_dict(json.loads(self._state_file.read_text()))
+        return ProjectState.from_dict(data)
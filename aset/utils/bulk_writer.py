@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Union
+
+from aset.utils.file_ops import PathLike, open_for_write, write_all
+
+_HAVE_DIR_FD = os.open in os.supports_dir_fd
+
+
+class BulkWriter:
+    """
+    Buffers small file writes and flushes them together.
+
+    On flush, files are grouped by parent directory: each directory is
+    created and opened once, and its files are opened relative to it
+    (openat). Later adds for the same path replace earlier ones.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[Path, bytes] = {}
+
+    def add(self, path: PathLike, data: Union[str, bytes]) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._pending[Path(path)] = data
+
+    def flush(self) -> List[Path]:
+        by_dir: Dict[Path, List[Path]] = defaultdict(list)
+        for path in self._pending:
+            by_dir[path.parent].append(path)
+
+        written: List[Path] = []
+        for parent, paths in by_dir.items():
+            parent.mkdir(parents=True, exist_ok=True)
+            dir_fd = os.open(parent, os.O_RDONLY) if _HAVE_DIR_FD else None
+            try:
+                for path in paths:
+                    fd = open_for_write(path.name, dir_fd) if dir_fd is not None else open_for_write(path)
+                    try:
+                        write_all(fd, self._pending[path])
+                    finally:
+                        os.close(fd)
+                    written.append(path)
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
+
+        self._pending.clear()
+        return written
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
+from aset.utils import json_utils
+from aset.utils.file_ops import open_for_write, write_all
+from aset.utils.uring_writer import HAVE_URING, UringBatchWriter
 
-FILE_START_RE = re.compile(r"^---FILE_START\s+(.+?)---\s*$")
-FILE_END_RE = re.compile(r"^---FILE_END\s+(.+?)---\s*$")
+
+# One pattern for both markers so the whole text is scanned in a single pass.
+# `[ \t\r]*$` (not `\s*$`) keeps a match from running past the end of its line.
+# Compiled on bytes: the markers are ASCII, and the bytes engine skips the
+# wide-character handling of str patterns.
+BUNDLE_RE = re.compile(rb"^---FILE_(START|END)[ \t]+(.+?)---[ \t\r]*$", re.M)
 
 
 @dataclass
 class FileBundle:
-    files: Dict[str, str]  # path -> content
+    files: List[Tuple[str, bytes]]  # (path, UTF-8 content), in bundle order
 
 
 class FileBundleParseError(ValueError):
@@ -36,42 +46,36 @@ def parse_file_bundle(text: str) -> FileBundle:
     We don't strictly require the FILE_MAP section (models sometimes omit it),
     but we do require FILE_START/FILE_END blocks.
     """
-    lines = text.splitlines()
-
-    files: Dict[str, List[str]] = {}
+    files: Dict[str, bytes] = {}
     current_path: str | None = None
-    current_buf: List[str] = []
+    body_start = 0
+    # Parse the UTF-8 encoding directly so bodies come out as the bytes we store.
+    buf = text.encode("utf-8")
 
-    def flush_current() -> None:
-        nonlocal current_path, current_buf
-        if current_path is not None:
-            files[current_path] = current_buf
-        current_path = None
-        current_buf = []
+    def line_no(pos: int) -> int:
+        return buf.count(b"\n", 0, pos) + 1
 
-    for i, line in enumerate(lines):
-        m_start = FILE_START_RE.match(line)
-        if m_start:
+    for m in BUNDLE_RE.finditer(buf):
+        kind, path = m.group(1), m.group(2).decode("utf-8").strip()
+        if kind == b"START":
             if current_path is not None:
-                raise FileBundleParseError(f"Nested FILE_START at line {i+1}")
-            current_path = m_start.group(1).strip()
-            current_buf = []
-            continue
-
-        m_end = FILE_END_RE.match(line)
-        if m_end:
-            end_path = m_end.group(1).strip()
-            if current_path is None:
-                raise FileBundleParseError(f"FILE_END without FILE_START at line {i+1}")
-            if end_path != current_path:
-                raise FileBundleParseError(
-                    f"Mismatched FILE_END at line {i+1}: got {end_path}, expected {current_path}"
-                )
-            flush_current()
+                raise FileBundleParseError(f"Nested FILE_START at line {line_no(m.start())}")
+            current_path = path
+            body_start = m.end() + 1  # skip the marker's newline
             continue
 
-        if current_path is not None:
-            current_buf.append(line)
+        if current_path is None:
+            raise FileBundleParseError(f"FILE_END without FILE_START at line {line_no(m.start())}")
+        if path != current_path:
+            raise FileBundleParseError(
+                f"Mismatched FILE_END at line {line_no(m.start())}: got {path}, expected {current_path}"
+            )
+        body = buf[body_start : m.start()]
+        if b"\r" in body:
+            body = b"\n".join(body.splitlines())
+        # A repeated path keeps the last body.
+        files[current_path] = body.rstrip() + b"\n"
+        current_path = None
 
     if current_path is not None:
         raise FileBundleParseError(f"Unclosed FILE_START for {current_path}")
@@ -79,18 +83,143 @@ def parse_file_bundle(text: str) -> FileBundle:
     if not files:
         raise FileBundleParseError("No files found. LLM output may not follow file bundle format.")
 
-    joined = {p: "\n".join(buf).rstrip() + "\n" for p, buf in files.items()}
-    return FileBundle(files=joined)
+    return FileBundle(files=list(files.items()))
+
+
+FILE_MAP_RE = re.compile(r"---FILE_MAP_START---\s*\n(.*?)\n\s*---FILE_MAP_END---", re.S)
+FILE_END_RE = re.compile(r"^---FILE_END[ \t]+(.+?)---[ \t\r]*$", re.M)
+
+
+def read_until_bundle_complete(chunks: Iterable[str]) -> str:
+    """
+    Accumulate streamed text until a FILE_END block has arrived for every
+    file listed in the FILE_MAP (in any order), then stop consuming (and
+    close the stream if it supports it). Without a FILE_MAP, or if the
+    stream ends before every listed file is closed, the whole stream is read.
+    """
+    text = ""
+    pending: set[str] | None = None
+    scan_from = 0
+
+    for chunk in chunks:
+        text += chunk
+
+        if pending is None:
+            m = FILE_MAP_RE.search(text)
+            if m is None:
+                continue
+            listed = {ln.strip() for ln in m.group(1).splitlines() if ln.strip()}
+            if not listed:
+                continue
+            pending = listed
+            scan_from = m.end()
+
+        # Only scan complete lines; a marker may still be arriving.
+        last_nl = text.rfind("\n", scan_from)
+        if last_nl == -1:
+            continue
+        for end in FILE_END_RE.finditer(text, scan_from, last_nl):
+            pending.discard(end.group(1).strip())
+            if not pending:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+                return text[: end.end()] + "\n"
+        scan_from = last_nl + 1
+
+    return text
+
+
+_WRITE_WORKERS = 8
+
+
+def _write_bytes(target: Path, data: bytes) -> None:
+    fd = open_for_write(target)
+    try:
+        write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
+HASHES_FILE = ".aset_hashes.json"
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _load_hashes(out_dir: Path) -> Dict[str, List]:
+    """rel_path -> [content hash, mtime_ns] from the last write_file_bundle into `out_dir`."""
+    try:
+        data = json_utils.loads((out_dir / HASHES_FILE).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_hashes(out_dir: Path, hashes: Dict[str, List]) -> None:
+    tmp = out_dir / f"{HASHES_FILE}.{os.getpid()}.tmp"
+    tmp.write_bytes(json_utils.dumps(hashes, sort_keys=True))
+    os.replace(tmp, out_dir / HASHES_FILE)
+
+
+def _unchanged(target: Path, entry: object, digest: str) -> bool:
+    # The recorded mtime guards against edits made behind our back.
+    if not isinstance(entry, list) or len(entry) != 2 or entry[0] != digest:
+        return False
+    try:
+        return target.stat().st_mtime_ns == entry[1]
+    except OSError:
+        return False
 
 
 def write_file_bundle(bundle: FileBundle, out_dir: Path) -> List[Path]:
+    """
+    Write every file in `bundle` under `out_dir` and return the
+    paths actually written. Files whose content matches the hash recorded
+    in `out_dir/.aset_hashes.json` by a previous call are left untouched.
+    Directories are created once each, then the files are written in one
+    io_uring batch (Linux + liburing) or concurrently on a thread pool.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
-    written: List[Path] = []
-    for rel_path, content in bundle.files.items():
+    hashes = _load_hashes(out_dir)
+    tasks: List[Tuple[Path, bytes]] = []
+    digests: List[Tuple[str, str]] = []
+    for rel_path, data in bundle.files:
         # Normalize paths
         rel_path = rel_path.lstrip("/").replace("\\", "/")
         target = out_dir / rel_path
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(content, encoding="utf-8")
-        written.append(target)
-    return written
+        digest = _content_hash(data)
+        if _unchanged(target, hashes.get(rel_path), digest):
+            continue
+        tasks.append((target, data))
+        digests.append((rel_path, digest))
+
+    if not tasks:
+        return []
+
+    for parent in {target.parent for target, _ in tasks}:
+        parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        if HAVE_URING and len(tasks) > 1:
+            # One io_uring submission for the whole bundle.
+            UringBatchWriter().write(tasks)
+        elif len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=min(_WRITE_WORKERS, len(tasks))) as pool:
+                # list() re-raises the first OSError, like the sequential path.
+                list(pool.map(lambda t: _write_bytes(*t), tasks))
+        else:
+            for target, data in tasks:
+                _write_bytes(target, data)
+    except OSError:
+        # Unknown which files landed; forget them so the next call rewrites.
+        for rel_path, _ in digests:
+            hashes.pop(rel_path, None)
+        _save_hashes(out_dir, hashes)
+        raise
+
+    for (target, _), (rel_path, digest) in zip(tasks, digests):
+        hashes[rel_path] = [digest, target.stat().st_mtime_ns]
+    _save_hashes(out_dir, hashes)
+    return [target for target, _ in tasks]
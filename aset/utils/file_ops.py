@@ -1,11 +1,28 @@
+import os
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 
 PathLike = Union[str, Path]
 
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
 
 def ensure_dir(path: PathLike) -> Path:
     p = Path(path)
     p.mkdir(parents=True, exist_ok=True)
     return p
+
+
+def open_for_write(path: PathLike, dir_fd: Optional[int] = None) -> int:
+    """Raw fd for `path`, created or truncated (relative to `dir_fd` if given)."""
+    if dir_fd is None:
+        return os.open(path, _OPEN_FLAGS, 0o644)
+    return os.open(path, _OPEN_FLAGS, 0o644, dir_fd=dir_fd)
+
+
+def write_all(fd: int, data: bytes) -> None:
+    """os.write until all of `data` is out (writes to regular files may be short)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # orjson is optional; it is much faster on large prompt payloads
+    import orjson
+except ImportError:  # pragma: no cover - fallback path
+    orjson = None
+
+
+def dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """
+    Serialize `obj` to UTF-8 JSON bytes (compact, or 2-space indented).
+    Uses orjson when installed, the stdlib otherwise.
+    """
+    if orjson is not None:
+        option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, sort_keys=sort_keys, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,24 +1,52 @@
 import logging
-from typing import Optional
+import sys
+import time
+from typing import TextIO
 
-_LOGGER: Optional[logging.Logger] = None
 
+def _make_formatter(stream: TextIO) -> logging.Formatter:
+    if stream.isatty():
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] [%(levelname)s] %(name)s - %(message)s",
+            datefmt="%Y-%m-%dT%H:%M:%SZ",
+        )
+        # UTC timestamps avoid the per-record timezone conversion of localtime.
+        formatter.converter = time.gmtime
+        return formatter
+    return logging.Formatter(fmt="%(levelname)s %(name)s %(message)s")
 
-def get_logger(name: str = "ASET") -> logging.Logger:
-    global _LOGGER
-    if _LOGGER is not None:
-        return _LOGGER
+
+def _below_warning(record: logging.LogRecord) -> bool:
+    return record.levelno < logging.WARNING
+
+
+def get_logger(name: str = "ASET", skip_process_info: bool = False) -> logging.Logger:
+    """
+    Logger with INFO and below on stdout and WARNING and above on stderr.
+
+    `skip_process_info=True` stops logging from collecting thread/process
+    fields on every record. That setting is process-wide, so only the
+    application entry point should pass it.
+    """
+    if skip_process_info:
+        # None of the formats here use thread/process fields.
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
 
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    if logger.handlers:
+        return logger
+
+    out = logging.StreamHandler(sys.stdout)
+    out.setFormatter(_make_formatter(sys.stdout))
+    out.addFilter(_below_warning)
+    logger.addHandler(out)
 
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        fmt="[%(asctime)s] [%(levelname)s] %(name)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    err = logging.StreamHandler(sys.stderr)
+    err.setFormatter(_make_formatter(sys.stderr))
+    err.setLevel(logging.WARNING)
+    logger.addHandler(err)
 
-    _LOGGER = logger
+    logger.setLevel(logging.INFO)
     return logger
@@ -2,11 +2,30 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Optional
 
 from core.agent_base import BaseAgent
 from core.protocol import ProjectBlueprint, Fragment, StateVariable
 
+_CANONICAL: tuple[str, ...] = (
+    "initialize_state",
+    "render_sidebar_controls",
+    "load_prices",
+    "compute_metrics",
+    "render_main_dashboard",
+)
+
+# Variant fragment IDs seen in model output -> canonical IDs.
+_ID_MAP: Mapping[str, str] = MappingProxyType({
+    "render_sidebar_input": "render_sidebar_controls",
+    "render_sidebar": "render_sidebar_controls",
+    "sidebar_controls": "render_sidebar_controls",
+    "render_ui": "render_main_dashboard",
+    "render_dashboard": "render_main_dashboard",
+    "main_dashboard": "render_main_dashboard",
+})
+
 
 class ArchitectAgent(BaseAgent):
     """
@@ -18,13 +37,7 @@ class ArchitectAgent(BaseAgent):
       This makes "missing import name" issues effectively impossible.
     """
 
-    CANONICAL_FRAGMENTS = [
-        "initialize_state",
-        "render_sidebar_controls",
-        "load_prices",
-        "compute_metrics",
-        "render_main_dashboard",
-    ]
+    CANONICAL_FRAGMENTS = _CANONICAL
 
     def execute(self, input_data: Any) -> ProjectBlueprint:
         user_prompt = str(input_data).strip()
@@ -80,7 +93,10 @@ class ArchitectAgent(BaseAgent):
         )
 
         try:
-            raw = self.llm.generate_text(prompt=prompt, system=system, route="architect")
+            # Stream, and stop generation as soon as the outer JSON object closes.
+            raw = self._read_until_json_closes(
+                self.llm.stream_text(prompt=prompt, system=system, route="architect")
+            )
         except Exception as e:
             self.log(f"Vertex call failed: {e}")
             return None
@@ -101,56 +117,57 @@ class ArchitectAgent(BaseAgent):
             return None
 
     def _fallback_blueprint(self, user_prompt: str, app_name: str) -> ProjectBlueprint:
-        return ProjectBlueprint(
+        # Literal, known-valid data: build with model_construct and skip validation.
+        return ProjectBlueprint.model_construct(
             app_name=app_name,
             global_state=[
-                StateVariable(
+                StateVariable.model_construct(
                     name="tickers",
                     type="list[str]",
                     description="List of stock symbols to track, e.g., ['AAPL', 'GOOG'].",
                 ),
-                StateVariable(
+                StateVariable.model_construct(
                     name="period",
                     type="str",
                     description="Time period for historical data, e.g., '1y', '6mo'.",
                 ),
-                StateVariable(
+                StateVariable.model_construct(
                     name="price_data",
                     type="pd.DataFrame",
                     description="DataFrame holding historical price data for all tracked tickers.",
                 ),
-                StateVariable(
+                StateVariable.model_construct(
                     name="status_message",
                     type="str",
                     description="User-facing status messages.",
                 ),
             ],
             logic_fragments=[
-                Fragment(
+                Fragment.model_construct(
                     id="initialize_state",
                     description="Initialize session state defaults (tickers, period, price_data, status_message).",
                     inputs=[],
                     outputs=["tickers", "period", "price_data", "status_message"],
                 ),
-                Fragment(
+                Fragment.model_construct(
                     id="render_sidebar_controls",
                     description="Render sidebar UI for managing tickers and selecting period.",
                     inputs=["tickers", "period"],
                     outputs=["tickers", "period"],
                 ),
-                Fragment(
+                Fragment.model_construct(
                     id="load_prices",
                     description="Fetch historical prices for tickers and period. Use yfinance or mock fallback.",
                     inputs=["tickers", "period"],
                     outputs=["price_data", "status_message"],
                 ),
-                Fragment(
+                Fragment.model_construct(
                     id="compute_metrics",
                     description="Compute latest price and percent change from a series.",
                     inputs=["price_series"],
                     outputs=["metrics_dict"],
                 ),
-                Fragment(
+                Fragment.model_construct(
                     id="render_main_dashboard",
                     description="Render chart + metrics for selected ticker.",
                     inputs=["tickers", "price_data", "status_message"],
@@ -172,40 +189,27 @@ class ArchitectAgent(BaseAgent):
           render_sidebar_input -> render_sidebar_controls
           render_ui -> render_main_dashboard
         """
-        id_map = {
-            "render_sidebar_input": "render_sidebar_controls",
-            "render_sidebar": "render_sidebar_controls",
-            "sidebar_controls": "render_sidebar_controls",
-            "render_ui": "render_main_dashboard",
-            "render_dashboard": "render_main_dashboard",
-            "main_dashboard": "render_main_dashboard",
-        }
-
         # Rewrite fragment IDs
         new_frags: list[Fragment] = []
-        seen = set()
+        seen: set[str] = set()
 
         for f in bp.logic_fragments:
-            new_id = id_map.get(f.id, f.id)
-            f2 = f.model_copy(update={"id": new_id})
+            new_id = _ID_MAP.get(f.id, f.id)
 
             # If multiple map to same canonical id, keep the first occurrence.
-            if f2.id in seen:
+            if new_id in seen:
                 continue
 
-            new_frags.append(f2)
-            seen.add(f2.id)
-
-        bp = bp.model_copy(update={"logic_fragments": new_frags})
+            new_frags.append(f if new_id == f.id else f.model_copy(update={"id": new_id}))
+            seen.add(new_id)
 
         # Ensure global_state has the basics we use in the app
         gs_names = {s.name for s in bp.global_state}
         gs_out = list(bp.global_state)
 
         def add_state(name: str, typ: str, desc: str) -> None:
-            nonlocal gs_out
             if name not in gs_names:
-                gs_out.append(StateVariable(name=name, type=typ, description=desc))
+                gs_out.append(StateVariable.model_construct(name=name, type=typ, description=desc))
                 gs_names.add(name)
 
         add_state("tickers", "list[str]", "List of tickers to track.")
@@ -213,19 +217,16 @@ class ArchitectAgent(BaseAgent):
         add_state("price_data", "pd.DataFrame", "Price history data.")
         add_state("status_message", "str", "User-facing status messages.")
 
-        bp = bp.model_copy(update={"global_state": gs_out})
-
         # Ensure canonical fragments exist; add minimal ones if missing
-        frag_ids = {f.id for f in bp.logic_fragments}
+        ensured_frags: list[Fragment] = []
 
         def ensure_fragment(fid: str, desc: str, inputs: list[str], outputs: list[str]) -> None:
-            nonlocal bp
-            if fid in frag_ids:
+            if fid in seen:
                 return
-            bp.logic_fragments.append(
-                Fragment(id=fid, description=desc, inputs=inputs, outputs=outputs)
+            ensured_frags.append(
+                Fragment.model_construct(id=fid, description=desc, inputs=inputs, outputs=outputs)
             )
-            frag_ids.add(fid)
+            seen.add(fid)
 
         ensure_fragment(
             "initialize_state",
@@ -258,7 +259,9 @@ class ArchitectAgent(BaseAgent):
             [],
         )
 
-        return bp
+        return bp.model_copy(
+            update={"logic_fragments": new_frags + ensured_frags, "global_state": gs_out}
+        )
 
     def _title_case_app_name(self, prompt: str) -> str:
         cleaned = re.sub(r"[^a-zA-Z0-9 ]+", "", prompt).strip()
@@ -266,6 +269,56 @@ class ArchitectAgent(BaseAgent):
             return "ASET App"
         return " ".join(w.capitalize() for w in cleaned.split()[:6])
 
+    def _read_until_json_closes(self, chunks: Iterator[str]) -> str:
+        """
+        Consume streamed chunks until the first top-level {...} that decodes to
+        a JSON object closes, then close the stream. Brace groups that are not
+        JSON (e.g. a "{placeholder}" in prose) are skipped and reading goes on.
+        Brace depth ignores braces inside JSON strings.
+        Returns the text read so far (everything if no object ever closed).
+        """
+        parts: list[str] = []
+        read = 0
+        obj_start = 0
+        depth = 0
+        started = in_string = escaped = False
+        decoder = json.JSONDecoder()
+        try:
+            for chunk in chunks:
+                for i, ch in enumerate(chunk):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif ch == "\\":
+                            escaped = True
+                        elif ch == '"':
+                            in_string = False
+                    elif ch == '"' and started:
+                        in_string = True
+                    elif ch == "{":
+                        if not started:
+                            obj_start = read + i
+                        depth += 1
+                        started = True
+                    elif ch == "}" and started:
+                        depth -= 1
+                        if depth == 0:
+                            text = "".join(parts) + chunk[: i + 1]
+                            try:
+                                obj, _ = decoder.raw_decode(text, obj_start)
+                            except json.JSONDecodeError:
+                                obj = None
+                            if isinstance(obj, dict):
+                                return text
+                            started = False
+                parts.append(chunk)
+                read += len(chunk)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+        return "".join(parts)
+
     def _extract_json_object(self, text: str) -> Optional[str]:
         if not text:
             return None
@@ -274,18 +327,35 @@ class ArchitectAgent(BaseAgent):
         if start == -1:
             return None
 
+        decoder = json.JSONDecoder()
+        while True:
+            try:
+                _, end = decoder.raw_decode(text, start)
+                return text[start:end]
+            except json.JSONDecodeError:
+                pass
+            # Not JSON (e.g. a "{placeholder}" in prose): skip its brace group
+            # (or just this brace if it never closes) and try the next object.
+            close = self._matching_brace(text, start)
+            start = text.find("{", (close if close != -1 else start) + 1)
+            if start == -1:
+                return None
+
+    @staticmethod
+    def _matching_brace(text: str, start: int) -> int:
+        """Index of the "}" closing the "{" at `start`, or -1. Jumps between braces with str.find."""
         depth = 0
-        for i in range(start, len(text)):
-            ch = text[i]
-            if ch == "{":
+        i = start - 1
+        while True:
+            nxt_o = text.find("{", i + 1)
+            nxt_c = text.find("}", i + 1)
+            if nxt_c == -1:
+                return -1
+            if nxt_o != -1 and nxt_o < nxt_c:
                 depth += 1
-            elif ch == "}":
+                i = nxt_o
+            else:
                 depth -= 1
+                i = nxt_c
                 if depth == 0:
-                    candidate = text[start : i + 1].strip()
-                    try:
-                        json.loads(candidate)
-                        return candidate
-                    except Exception:
-                        return None
-        return None
+                    return i
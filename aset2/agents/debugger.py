@@ -11,6 +11,8 @@ class DebuggerAgent(BaseAgent):
     - integrate/tests -> Vertex (future escalation)
     """
 
+    SYSTEM = "You fix Python code. Output only the corrected full code, no commentary."
+
     def execute(self, input_data: Any) -> str:
         prompt = str(input_data)
 
@@ -18,6 +20,16 @@ class DebuggerAgent(BaseAgent):
         fix = self.llm.generate_code(
             prompt=prompt,
             route="debug_fast",
-            system="You fix Python code. Output only the corrected full code, no commentary.",
+            system=self.SYSTEM,
         )
         return fix
+
+    async def aexecute(self, input_data: Any) -> str:
+        prompt = str(input_data)
+
+        self.log("Requesting fix from local model (route=debug_fast).")
+        return await self.llm.agenerate_code(
+            prompt=prompt,
+            route="debug_fast",
+            system=self.SYSTEM,
+        )
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Set
+from typing import Any
 from core.agent_base import BaseAgent
 
+# Kept sorted so every run emits byte-identical requirements.
+_REQUIREMENTS_TXT = "numpy>=1.24\npandas>=2.0\nstreamlit>=1.30\nyfinance>=0.2\n"
+
 
 class LibrarianAgent(BaseAgent):
     """
@@ -17,11 +20,4 @@ class LibrarianAgent(BaseAgent):
 
     def execute(self, input_data: Any) -> str:
         self.log("Producing requirements.txt for generated project")
-
-        reqs: Set[str] = {
-            "streamlit>=1.30",
-            "pandas>=2.0",
-            "numpy>=1.24",
-            "yfinance>=0.2",
-        }
-        return "\n".join(sorted(reqs)) + "\n"
+        return _REQUIREMENTS_TXT
@@ -1,67 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, List
+import string
+from typing import Any, Generator
 
 from core.agent_base import BaseAgent
 from core.protocol import Fragment
 from core.sandbox import Sandbox
-from agents.debugger import DebuggerAgent
 
 
-class LogicCoderAgent(BaseAgent):
-    """
-    Deterministic implementations for the canonical Stock Tracker fragments:
-      - initialize_state
-      - render_sidebar_controls
-      - load_prices
-      - compute_metrics
-      - render_main_dashboard
-
-    Unknown fragments fall back to a stub.
-    """
-
-    def __init__(self, llm, verbose: bool = True):
-        super().__init__(llm, verbose)
-        self.sandbox = Sandbox()
-        self.debugger_agent = DebuggerAgent(llm, verbose=verbose)
-
-    def execute(self, input_data: Any) -> str:
-        fragment: Fragment = input_data
-        self.log(f"Generating code for fragment: {fragment.id}")
-        return self.generate_robust_code(fragment)
-
-    def generate_robust_code(self, fragment: Fragment) -> str:
-        attempts = 0
-
-        code = self._specialized_code(fragment)
-        if code is None:
-            code = self._stub_code(fragment)
-
-        while attempts < 3:
-            error = self.sandbox.run_check(code)
-            if not error:
-                return code
-
-            self.log(f"Attempt {attempts + 1} failed: {error}")
-            fix_prompt = (
-                "Fix the Python code below so it parses and runs.\n\n"
-                f"FRAGMENT CONTRACT:\n"
-                f"- id: {fragment.id}\n"
-                f"- inputs: {fragment.inputs}\n"
-                f"- outputs: {fragment.outputs}\n\n"
-                f"ERROR:\n{error}\n\n"
-                f"CODE:\n{code}\n"
-            )
-            code = self.debugger_agent.execute(fix_prompt)
-            attempts += 1
-
-        raise RuntimeError("Failed to generate working code after 3 attempts.")
-
-    def _specialized_code(self, fragment: Fragment) -> str | None:
-        fid = fragment.id
-
-        if fid == "initialize_state":
-            return '''import pandas as pd
+_INITIALIZE_STATE_CODE = '''import pandas as pd
 
 def initialize_state():
     """
@@ -75,8 +22,7 @@ def initialize_state():
     return {"tickers": tickers, "period": period, "price_data": price_data, "status_message": status_message}
 '''
 
-        if fid == "render_sidebar_controls":
-            return '''import streamlit as st
+_RENDER_SIDEBAR_CONTROLS_CODE = '''import streamlit as st
 
 def render_sidebar_controls(tickers, period):
     """
@@ -110,9 +56,29 @@ def render_sidebar_controls(tickers, period):
     return {"tickers": tickers, "period": period}
 '''
 
-        if fid == "load_prices":
-            return '''import pandas as pd
-import numpy as np
+_LOAD_PRICES_CODE = '''import pandas as pd
+import streamlit as st
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch(tickers_key, period):
+    """
+    yfinance download, memoized for 10 minutes per (tickers, period) so
+    Streamlit reruns don't refetch. Failures are not cached; an empty
+    result is raised as one so it isn't either.
+    """
+    import yfinance as yf
+
+    data = yf.download(
+        tickers=list(tickers_key),
+        period=period,
+        group_by="ticker",
+        auto_adjust=True,
+        progress=False,
+        threads=True,
+    )
+    if data is None or data.empty:
+        raise ValueError("No price data returned (check tickers or period).")
+    return data
 
 def load_prices(tickers, period):
     """
@@ -121,22 +87,15 @@ def load_prices(tickers, period):
     price_data is a DataFrame with a DateTime index and one column per ticker.
     """
     status_message = ""
-    tickers = [t.strip().upper() for t in (tickers or []) if t and t.strip()]
+    # dict.fromkeys drops repeated tickers but keeps their order.
+    tickers = list(dict.fromkeys(t.strip().upper() for t in (tickers or []) if t and t.strip()))
 
     if not tickers:
         return {"price_data": pd.DataFrame(), "status_message": "No tickers provided."}
 
     try:
-        import yfinance as yf
-
-        data = yf.download(
-            tickers=tickers,
-            period=period,
-            group_by="ticker",
-            auto_adjust=True,
-            progress=False,
-            threads=True,
-        )
+        # Sorted so the same selection always hits the same cache entry.
+        data = _fetch(tuple(sorted(tickers)), period)
 
         price_df = pd.DataFrame()
 
@@ -171,54 +130,63 @@ def load_prices(tickers, period):
         # Mock fallback: random walk per ticker
         n = 180
         idx = pd.date_range(end=pd.Timestamp.today().normalize(), periods=n, freq="D")
+        # numpy is only needed for mock data; keep it off logic.py's import path.
+        import numpy as np
+
         rng = np.random.default_rng(42)
 
-        mock = {}
-        for t in tickers:
-            start = float(rng.uniform(50, 500))
-            steps = rng.normal(loc=0.0, scale=1.0, size=n).cumsum()
-            series = start + steps
-            series = np.maximum(series, 1.0)
-            mock[t] = series
+        # One draw for all tickers: rows are tickers, columns are days.
+        starts = rng.uniform(50, 500, size=len(tickers))
+        steps = rng.normal(loc=0.0, scale=1.0, size=(len(tickers), n)).cumsum(axis=1)
+        prices = np.maximum(starts[:, None] + steps, 1.0)
 
-        price_df = pd.DataFrame(mock, index=idx)
+        price_df = pd.DataFrame(prices.T, index=idx, columns=tickers)
         status_message = f"Using mock data (yfinance unavailable or failed): {e}"
         return {"price_data": price_df, "status_message": status_message}
 '''
 
-        if fid == "compute_metrics":
-            return '''def compute_metrics(price_series):
+_COMPUTE_METRICS_CODE = '''import math
+
+try:  # optional: compile the metrics kernel to native code
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+@njit(cache=True)
+def _metrics_kernel(arr):
+    """(latest, change, pct_change) of a float64 array; NaN where undefined."""
+    n = arr.shape[0]
+    if n == 0:
+        return math.nan, math.nan, math.nan
+    latest = arr[n - 1]
+    if n == 1:
+        return latest, math.nan, math.nan
+    prev = arr[n - 2]
+    change = latest - prev
+    pct = (change / prev) * 100.0 if prev != 0 else math.nan
+    return latest, change, pct
+
+def compute_metrics(price_series):
     """
     Calculate key metrics like latest price and percentage change from a price series.
     Returns {metrics_dict}.
     """
-    metrics_dict = {"latest": None, "change": None, "pct_change": None}
-
-    if price_series is None:
-        return {"metrics_dict": metrics_dict}
-
-    try:
-        s = price_series.dropna()
-        if len(s) < 2:
-            if len(s) == 1:
-                metrics_dict["latest"] = float(s.iloc[-1])
-            return {"metrics_dict": metrics_dict}
-
-        latest = float(s.iloc[-1])
-        prev = float(s.iloc[-2])
-        change = latest - prev
-        pct = (change / prev) * 100.0 if prev != 0 else None
-
-        metrics_dict["latest"] = latest
-        metrics_dict["change"] = change
-        metrics_dict["pct_change"] = pct
-        return {"metrics_dict": metrics_dict}
-    except Exception:
-        return {"metrics_dict": metrics_dict}
+    latest = change = pct = None
+
+    if price_series is not None:
+        try:
+            # Plain float64 buffer; .iloc goes through pandas' indexer machinery.
+            arr = price_series.dropna().to_numpy(dtype="float64", copy=False)
+            latest, change, pct = (None if math.isnan(v) else float(v) for v in _metrics_kernel(arr))
+        except Exception:
+            latest = change = pct = None
+
+    # metrics_dict is the fragment's declared output name, so the wrapper stays.
+    return {"metrics_dict": {"latest": latest, "change": change, "pct_change": pct}}
 '''
 
-        if fid == "render_main_dashboard":
-            return '''import streamlit as st
+_RENDER_MAIN_DASHBOARD_CODE = '''import streamlit as st
 
 def render_main_dashboard(tickers, price_data, status_message=""):
     """
@@ -249,10 +217,11 @@ def render_main_dashboard(tickers, price_data, status_message=""):
     metrics_out = compute_metrics(series)
     m = metrics_out.get("metrics_dict") or {}
 
+    latest, change, pct = m.get("latest"), m.get("change"), m.get("pct_change")
+
     c1, c2, c3 = st.columns(3)
-    c1.metric("Latest", f"{m.get('latest'):.2f}" if isinstance(m.get("latest"), (int, float)) else "—")
-    c2.metric("Change", f"{m.get('change'):+.2f}" if isinstance(m.get("change"), (int, float)) else "—")
-    pct = m.get("pct_change")
+    c1.metric("Latest", f"{latest:.2f}" if isinstance(latest, (int, float)) else "—")
+    c2.metric("Change", f"{change:+.2f}" if isinstance(change, (int, float)) else "—")
     c3.metric("% Change", f"{pct:+.2f}%" if isinstance(pct, (int, float)) else "—")
 
     st.line_chart(series, use_container_width=True)
@@ -260,24 +229,124 @@ def render_main_dashboard(tickers, price_data, status_message=""):
     return {}
 '''
 
-        return None
+# Fragment id -> hand-written implementation, built once at import.
+_SPECIALIZED: dict[str, str] = {
+    "initialize_state": _INITIALIZE_STATE_CODE,
+    "render_sidebar_controls": _RENDER_SIDEBAR_CONTROLS_CODE,
+    "load_prices": _LOAD_PRICES_CODE,
+    "compute_metrics": _COMPUTE_METRICS_CODE,
+    "render_main_dashboard": _RENDER_MAIN_DASHBOARD_CODE,
+}
 
-    def _stub_code(self, fragment: Fragment) -> str:
-        fn = fragment.id
-        args = ", ".join(fragment.inputs) if fragment.inputs else ""
 
-        outputs_list = fragment.outputs or []
-        out_dict_items = ", ".join([f"'{o}': {o}" for o in outputs_list])
+# Placeholder implementation for fragments without a specialized version.
+_STUB_TPL = string.Template(
+    "def $fn($args):\n"
+    '    """$desc"""\n'
+    "$assigns\n"
+    "    return {$items}\n"
+)
+
+
+class LogicCoderAgent(BaseAgent):
+    """
+    Deterministic implementations for the canonical Stock Tracker fragments:
+      - initialize_state
+      - render_sidebar_controls
+      - load_prices
+      - compute_metrics
+      - render_main_dashboard
 
-        assigns: List[str] = []
-        for o in outputs_list:
-            assigns.append(f"    {o} = None")
+    Unknown fragments fall back to a stub.
+    """
 
-        assigns_block = "\n".join(assigns) if assigns else "    pass"
+    def __init__(self, llm, verbose: bool = True):
+        super().__init__(llm, verbose)
+        self.sandbox = Sandbox()
+        self._debugger = None  # built on the first failed check
+
+    def execute(self, input_data: Any) -> str:
+        fragment: Fragment = input_data
+        self.log(f"Generating code for fragment: {fragment.id}")
+        return self.generate_robust_code(fragment)
 
+    async def aexecute(self, input_data: Any) -> str:
+        fragment: Fragment = input_data
+        self.log(f"Generating code for fragment: {fragment.id}")
+        return await self.agenerate_robust_code(fragment)
+
+    def generate_robust_code(self, fragment: Fragment) -> str:
+        code = self._specialized_code(fragment)
+        if code is not None:
+            return code  # hand-written and known to parse
+
+        # Debugger fixes go through the sync LLM API; no event loop involved.
+        steps = self._repair_steps(fragment)
+        try:
+            fix_prompt = next(steps)
+            while True:
+                fix_prompt = steps.send(self._debugger_agent().execute(fix_prompt))
+        except StopIteration as done:
+            return done.value
+
+    async def agenerate_robust_code(self, fragment: Fragment) -> str:
+        """Async `generate_robust_code`: debugger calls await the LLM instead of blocking."""
+        code = self._specialized_code(fragment)
+        if code is not None:
+            return code
+
+        steps = self._repair_steps(fragment)
+        try:
+            fix_prompt = next(steps)
+            while True:
+                fix_prompt = steps.send(await self._debugger_agent().aexecute(fix_prompt))
+        except StopIteration as done:
+            return done.value
+
+    def _repair_steps(self, fragment: Fragment) -> Generator[str, str, str]:
+        """
+        The check/fix loop shared by both entry points: yields a fix prompt
+        for each failed check, receives the debugger's code, and returns the
+        first code that passes.
+        """
+        code = self._stub_code(fragment)
+        for attempt in range(1, 4):
+            error = self.sandbox.run_check(code)
+            if not error:
+                return code
+
+            self.log(f"Attempt {attempt} failed: {error}")
+            code = yield self._fix_prompt(fragment, error, code)
+
+        raise RuntimeError("Failed to generate working code after 3 attempts.")
+
+    def _fix_prompt(self, fragment: Fragment, error: str, code: str) -> str:
         return (
-            f"def {fn}({args}):\n"
-            f"    \"\"\"{fragment.description}\"\"\"\n"
-            f"{assigns_block}\n"
-            f"    return {{{out_dict_items}}}\n"
+            "Fix the Python code below so it parses and runs.\n\n"
+            f"FRAGMENT CONTRACT:\n"
+            f"- id: {fragment.id}\n"
+            f"- inputs: {fragment.inputs}\n"
+            f"- outputs: {fragment.outputs}\n\n"
+            f"ERROR:\n{error}\n\n"
+            f"CODE:\n{code}\n"
+        )
+
+    def _debugger_agent(self):
+        if self._debugger is None:
+            from agents.debugger import DebuggerAgent
+
+            self._debugger = DebuggerAgent(self.llm, verbose=self.verbose)
+        return self._debugger
+
+    def _specialized_code(self, fragment: Fragment) -> str | None:
+        return _SPECIALIZED.get(fragment.id)
+
+    def _stub_code(self, fragment: Fragment) -> str:
+        outputs_list = fragment.outputs or []
+        return _STUB_TPL.substitute(
+            fn=fragment.id,
+            args=", ".join(fragment.inputs or []),
+            desc=fragment.description,
+            assigns="\n".join(f"    {o} = None" for o in outputs_list) or "    pass",
+            items=", ".join(f"'{o}': {o}" for o in outputs_list),
         )
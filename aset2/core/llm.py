@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
 from dataclasses import dataclass
-from typing import Dict, Optional
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Iterator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class LLMProvider(ABC):
@@ -16,6 +24,21 @@ class LLMProvider(ABC):
     def generate_code(self, prompt: str, *, system: Optional[str] = None) -> str:
         raise NotImplementedError
 
+    def stream_text(self, prompt: str, *, system: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the response as it is generated. Closing the iterator early
+        stops generation. Default: one chunk with the full response.
+        """
+        yield self.generate_text(prompt, system=system)
+
+    async def agenerate_text(self, prompt: str, *, system: Optional[str] = None) -> str:
+        """Async `generate_text`. Default: the blocking call on a worker thread."""
+        return await asyncio.to_thread(self.generate_text, prompt, system=system)
+
+    async def agenerate_code(self, prompt: str, *, system: Optional[str] = None) -> str:
+        """Async `generate_code`. Default: the blocking call on a worker thread."""
+        return await asyncio.to_thread(self.generate_code, prompt, system=system)
+
 
 # -------------------------
 # Ollama (local)
@@ -37,21 +60,30 @@ class OllamaLLM(LLMProvider):
         self.cfg = cfg
         self.base_url = cfg.base_url.rstrip("/")
 
-    def _chat(self, prompt: str, system: Optional[str]) -> str:
-        url = f"{self.base_url}/api/chat"
+        # Keep-alive pool so repeated calls reuse the connection to the server.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _payload(self, prompt: str, system: Optional[str], stream: bool) -> dict:
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
 
-        payload = {
+        return {
             "model": self.cfg.model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
             "options": {"temperature": self.cfg.temperature},
         }
 
-        r = requests.post(url, json=payload, timeout=self.cfg.timeout_seconds)
+    def _chat(self, prompt: str, system: Optional[str]) -> str:
+        url = f"{self.base_url}/api/chat"
+        payload = self._payload(prompt, system, stream=False)
+
+        r = self.session.post(url, json=payload, timeout=self.cfg.timeout_seconds)
         r.raise_for_status()
         data = r.json()
 
@@ -61,6 +93,21 @@ class OllamaLLM(LLMProvider):
     def generate_text(self, prompt: str, *, system: Optional[str] = None) -> str:
         return self._chat(prompt, system)
 
+    def stream_text(self, prompt: str, *, system: Optional[str] = None) -> Iterator[str]:
+        url = f"{self.base_url}/api/chat"
+        payload = self._payload(prompt, system, stream=True)
+
+        # NDJSON: one {"message": {"content": ...}, "done": bool} object per line.
+        with self.session.post(url, json=payload, timeout=self.cfg.timeout_seconds, stream=True) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield (data.get("message") or {}).get("content", "")
+                if data.get("done"):
+                    break
+
     def generate_code(self, prompt: str, *, system: Optional[str] = None) -> str:
         code_system = system or "You are a senior software engineer. Output only code."
         return self._chat(prompt, code_system)
@@ -100,10 +147,84 @@ class VertexLLM(LLMProvider):
     def generate_text(self, prompt: str, *, system: Optional[str] = None) -> str:
         return self._generate(prompt, system)
 
+    def stream_text(self, prompt: str, *, system: Optional[str] = None) -> Iterator[str]:
+        full_prompt = prompt if not system else f"{system}\n\n{prompt}"
+
+        for chunk in self.client.models.generate_content_stream(
+            model=self.cfg.model,
+            contents=full_prompt,
+            config={"temperature": self.cfg.temperature},
+        ):
+            yield getattr(chunk, "text", "") or ""
+
     def generate_code(self, prompt: str, *, system: Optional[str] = None) -> str:
         code_system = system or "You are a senior software engineer. Output only code."
         return self._generate(prompt, code_system)
 
+    async def _agenerate(self, prompt: str, system: Optional[str]) -> str:
+        # client.aio shares the client's connection pool; calls don't block the loop.
+        full_prompt = prompt if not system else f"{system}\n\n{prompt}"
+
+        resp = await self.client.aio.models.generate_content(
+            model=self.cfg.model,
+            contents=full_prompt,
+            config={"temperature": self.cfg.temperature},
+        )
+        return getattr(resp, "text", "") or ""
+
+    async def agenerate_text(self, prompt: str, *, system: Optional[str] = None) -> str:
+        return await self._agenerate(prompt, system)
+
+    async def agenerate_code(self, prompt: str, *, system: Optional[str] = None) -> str:
+        code_system = system or "You are a senior software engineer. Output only code."
+        return await self._agenerate(prompt, code_system)
+
+
+# -------------------------
+# Response cache
+# -------------------------
+class ResponseCache:
+    """
+    Exact-match response store: SQLite table kv(key, value, created) in WAL
+    mode. Entries older than `ttl_seconds` (24h by default) are misses and
+    are purged on open. Empty responses are never stored.
+    Safe to share between threads.
+    """
+
+    TTL_SECONDS = 24 * 3600
+
+    def __init__(self, path: Path, ttl_seconds: float = TTL_SECONDS):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+        self._db.execute("DELETE FROM kv WHERE created < ?", (time.time() - ttl_seconds,))
+        self._db.commit()
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM kv WHERE key = ? AND created >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        if not value.strip():
+            return  # an empty response is a failed call, not an answer to replay
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO kv (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._db.commit()
+
 
 # -------------------------
 # Router
@@ -115,14 +236,27 @@ class RoutedLLM(LLMProvider):
     Agents can call:
       self.llm.generate_text(..., route="architect")
       self.llm.generate_code(..., route="fragment")
+
+    With a `cache`, responses from low-temperature providers are reused
+    for identical (route, system, prompt) calls.
     """
 
-    def __init__(self, providers: Dict[str, LLMProvider], routes: Dict[str, str], default: str):
+    # Above this temperature responses are meant to vary; don't pin them.
+    MAX_CACHED_TEMPERATURE = 0.3
+
+    def __init__(
+        self,
+        providers: Dict[str, LLMProvider],
+        routes: Dict[str, str],
+        default: str,
+        cache: Optional[ResponseCache] = None,
+    ):
         if default not in providers:
             raise ValueError(f"Default provider '{default}' not found in providers={list(providers.keys())}")
         self.providers = providers
         self.routes = routes
         self.default = default
+        self.cache = cache
 
     def _pick(self, route: Optional[str]) -> LLMProvider:
         if route and route in self.routes:
@@ -136,8 +270,83 @@ class RoutedLLM(LLMProvider):
             return provider
         return self.providers[self.default]
 
+    def _cache_key(self, kind: str, provider: LLMProvider, route: Optional[str], prompt: str, system: Optional[str]) -> Optional[str]:
+        cfg = getattr(provider, "cfg", None)
+        if self.cache is None or getattr(cfg, "temperature", 0.0) > self.MAX_CACHED_TEMPERATURE:
+            return None
+        return ResponseCache.key(kind, getattr(cfg, "model", ""), route or "", system or "", prompt)
+
+    def _cached(
+        self,
+        kind: str,
+        route: Optional[str],
+        prompt: str,
+        system: Optional[str],
+        call: Callable[[LLMProvider], str],
+    ) -> str:
+        provider = self._pick(route)
+        key = self._cache_key(kind, provider, route, prompt, system)
+        if key is None:
+            return call(provider)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        out = call(provider)
+        self.cache.put(key, out)
+        return out
+
+    async def _acached(
+        self,
+        kind: str,
+        route: Optional[str],
+        prompt: str,
+        system: Optional[str],
+        call: Callable[[LLMProvider], Awaitable[str]],
+    ) -> str:
+        provider = self._pick(route)
+        key = self._cache_key(kind, provider, route, prompt, system)
+        if key is None:
+            return await call(provider)
+        # sqlite blocks; keep it off the event loop.
+        hit = await asyncio.to_thread(self.cache.get, key)
+        if hit is not None:
+            return hit
+        out = await call(provider)
+        await asyncio.to_thread(self.cache.put, key, out)
+        return out
+
     def generate_text(self, prompt: str, *, system: Optional[str] = None, route: Optional[str] = None) -> str:  # type: ignore[override]
-        return self._pick(route).generate_text(prompt, system=system)
+        return self._cached("text", route, prompt, system, lambda p: p.generate_text(prompt, system=system))
+
+    async def agenerate_text(self, prompt: str, *, system: Optional[str] = None, route: Optional[str] = None) -> str:  # type: ignore[override]
+        return await self._acached("text", route, prompt, system, lambda p: p.agenerate_text(prompt, system=system))
 
     def generate_code(self, prompt: str, *, system: Optional[str] = None, route: Optional[str] = None) -> str:  # type: ignore[override]
-        return self._pick(route).generate_code(prompt, system=system)
+        return self._cached("code", route, prompt, system, lambda p: p.generate_code(prompt, system=system))
+
+    async def agenerate_code(self, prompt: str, *, system: Optional[str] = None, route: Optional[str] = None) -> str:  # type: ignore[override]
+        return await self._acached("code", route, prompt, system, lambda p: p.agenerate_code(prompt, system=system))
+
+    def stream_text(self, prompt: str, *, system: Optional[str] = None, route: Optional[str] = None) -> Iterator[str]:  # type: ignore[override]
+        provider = self._pick(route)
+        key = self._cache_key("text", provider, route, prompt, system)
+        if key is None:
+            return provider.stream_text(prompt, system=system)
+        return self._stream_cached(provider, key, prompt, system)
+
+    def _stream_cached(self, provider: LLMProvider, key: str, prompt: str, system: Optional[str]) -> Iterator[str]:
+        hit = self.cache.get(key)
+        if hit is not None:
+            yield hit
+            return
+        parts = []
+        try:
+            for chunk in provider.stream_text(prompt, system=system):
+                parts.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            # The caller closed the stream once it had what it needed (e.g. the
+            # architect's JSON object); replaying that much is enough for it.
+            self.cache.put(key, "".join(parts))
+            raise
+        self.cache.put(key, "".join(parts))
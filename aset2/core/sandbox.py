@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import ast
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 
@@ -11,14 +12,20 @@ class SandboxResult:
     error: Optional[str] = None
 
 
+@lru_cache(maxsize=256)
+def _syntax_error(code: str) -> Optional[str]:
+    # Caches the outcome rather than the AST: lru_cache does not memoize raised exceptions.
+    try:
+        ast.parse(code)
+        return None
+    except SyntaxError as e:
+        return f"SyntaxError: {e}"
+
+
 class Sandbox:
     """
     MVP: lightweight syntax check. Later we can run subprocess, venv, E2B, etc.
     """
 
     def run_check(self, code: str) -> Optional[str]:
-        try:
-            ast.parse(code)
-            return None
-        except SyntaxError as e:
-            return f"SyntaxError: {e}"
+        return _syntax_error(code)
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import json
-import subprocess
+import os
 import sys
+import threading
+import traceback
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Coroutine, Iterable, Iterator, Optional, TypeVar
 
 import yaml
 
-from core.llm import RoutedLLM, VertexLLM, VertexConfig, OllamaLLM, OllamaConfig
+try:  # optional: much faster JSON encoding
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+try:  # libyaml's C loader when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - pure-Python fallback
+    from yaml import SafeLoader
+
+from core.llm import RoutedLLM, VertexLLM, VertexConfig, OllamaLLM, OllamaConfig, ResponseCache
 from core.protocol import ProjectBlueprint
 from agents.architect import ArchitectAgent
 from agents.logic_coder import LogicCoderAgent
@@ -20,27 +36,54 @@ ROOT = Path(__file__).parent
 WORKSPACE = ROOT / "workspace"
 
 
+@lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime_ns: int) -> dict:
+    # mtime_ns only keys the cache, so an edited file is parsed again.
+    return yaml.load(Path(path).read_text(encoding="utf-8"), Loader=SafeLoader) or {}
+
+
 def load_config() -> dict:
+    """Parsed config.yaml, memoized until the file changes. Treat as read-only."""
     cfg_path = ROOT / "config.yaml"
-    if cfg_path.exists():
-        return yaml.safe_load(cfg_path.read_text(encoding="utf-8")) or {}
-    return {}
+    try:
+        mtime_ns = cfg_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return _load_config_cached(str(cfg_path), mtime_ns)
 
 
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
-def write_text(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
+def write_text(path: Path, content: str | Iterable[str]) -> None:
+    """Write a string, or stream an iterable of chunks, through one 1 MiB buffer."""
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        if isinstance(content, str):
+            f.write(content)
+        else:
+            f.writelines(content)
 
 
 def write_json(path: Path, data: dict) -> None:
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
 
 
 def build_llm_from_config(cfg: dict) -> RoutedLLM:
+    """
+    Build the routed LLM for `cfg`. Memoized on the canonical JSON of the
+    `llm` section, so repeated builds reuse the provider clients and pools.
+    """
     llm_cfg = (cfg.get("llm") or {})
+    return _build_llm_cached(json.dumps(llm_cfg, sort_keys=True, default=str))
+
+
+@lru_cache(maxsize=4)
+def _build_llm_cached(llm_cfg_json: str) -> RoutedLLM:
+    llm_cfg = json.loads(llm_cfg_json)
     router_cfg = (llm_cfg.get("router") or {})
     vertex_cfg = (llm_cfg.get("vertex") or {})
     ollama_cfg = (llm_cfg.get("ollama") or {})
@@ -67,14 +110,40 @@ def build_llm_from_config(cfg: dict) -> RoutedLLM:
         )
     )
 
+    cache = ResponseCache(WORKSPACE / ".llm_cache" / "responses.sqlite") if llm_cfg.get("cache", True) else None
+
     llm = RoutedLLM(
         providers={"vertex": vertex, "ollama": ollama},
         routes=router_cfg.get("routes", {}),
         default=router_cfg.get("default", "ollama"),
+        cache=cache,
     )
     return llm
 
 
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run `coro` on a background event loop thread and block for its result.
+
+    One loop serves every build, so the memoized LLM's async clients stay
+    bound to it. Running it on its own thread keeps build_project callable
+    from code that already has a loop running (Streamlit, Jupyter, async
+    services) and from several threads at once.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="aset-async", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
 def validate_generated_logic(project_dir: Path, blueprint: ProjectBlueprint) -> None:
     """
     Hard gate: ensure logic.py imports AND contains all fragment functions.
@@ -83,53 +152,47 @@ def validate_generated_logic(project_dir: Path, blueprint: ProjectBlueprint) ->
     during import, causing Streamlit ImportError later.
     """
     expected = [f.id for f in (blueprint.logic_fragments or [])]
-    expected_json = json.dumps(expected)
-
-    # Run a separate Python process so we get clean import semantics.
-    # cwd=project_dir ensures "import logic" imports the generated logic.py.
-    script = f"""
-import json
-import sys
-
-expected = json.loads({expected_json!r})
-
-try:
-    import logic
-except Exception as e:
-    print("FAILED_TO_IMPORT_LOGIC")
-    print(type(e).__name__ + ":", str(e))
-    raise
-
-missing = [name for name in expected if not hasattr(logic, name)]
-if missing:
-    print("MISSING_FRAGMENT_FUNCTIONS")
-    for m in missing:
-        print(m)
-    raise SystemExit(2)
-
-print("LOGIC_OK")
-"""
-
-    proc = subprocess.run(
-        [sys.executable, "-c", script],
-        cwd=str(project_dir),
-        capture_output=True,
-        text=True,
-    )
-
-    if proc.returncode != 0:
-        stdout = (proc.stdout or "").strip()
-        stderr = (proc.stderr or "").strip()
 
+    # Import in-process (no interpreter start-up) under a private module name,
+    # with project_dir on sys.path for any sibling imports. Both are undone
+    # after, along with any sibling modules loaded from project_dir; shared
+    # packages (pandas, streamlit, ...) stay imported for the next build.
+    module_name = "_aset_generated_logic"
+    spec = importlib.util.spec_from_file_location(module_name, project_dir / "logic.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    sys.path.insert(0, str(project_dir))
+
+    report: list[str] = []
+    error = ""
+    try:
+        spec.loader.exec_module(module)
+    except (Exception, SystemExit):
+        report = ["FAILED_TO_IMPORT_LOGIC"]
+        error = traceback.format_exc()
+    else:
+        missing = [name for name in expected if not hasattr(module, name)]
+        if missing:
+            report = ["MISSING_FRAGMENT_FUNCTIONS", *missing]
+    finally:
+        sys.path.remove(str(project_dir))
+        sys.modules.pop(module_name, None)
+        root = str(project_dir.resolve())
+        for name, mod in list(sys.modules.items()):
+            mod_file = getattr(mod, "__file__", None)
+            if mod_file and os.path.realpath(mod_file).startswith(root + os.sep):
+                sys.modules.pop(name, None)
+
+    if report:
         msg_lines = [
             "❌ Generated logic.py failed validation.",
             f"Project: {project_dir}",
             "",
-            "STDOUT:",
-            stdout or "(empty)",
+            "RESULT:",
+            "\n".join(report),
             "",
-            "STDERR:",
-            stderr or "(empty)",
+            "TRACEBACK:",
+            error.strip() or "(empty)",
             "",
             "What this means:",
             "- Either logic.py failed to import (syntax error, missing dependency, runtime error), OR",
@@ -160,16 +223,23 @@ def build_project(prompt: str) -> Path:
     project_dir = WORKSPACE / blueprint.app_name.replace(" ", "_").lower()
     ensure_dir(project_dir)
 
-    write_json(project_dir / "blueprint.json", blueprint.model_dump())
+    write_json(project_dir / "blueprint.json", blueprint.model_dump(mode="json", warnings=False))
 
     # Phase 2: Logic Fabrication
-    logic_parts = ["# Generated by ASET\n\n"]
-    for frag in blueprint.logic_fragments:
-        code = coder.execute(frag)
-        logic_parts.append(code)
-        logic_parts.append("\n\n")
+    # Fragments are independent; generate them concurrently so LLM repairs overlap.
+    # gather() keeps blueprint order in logic.py.
+    async def generate_fragments() -> list[str]:
+        return list(await asyncio.gather(*(coder.aexecute(f) for f in blueprint.logic_fragments)))
+
+    codes = _run_async(generate_fragments())
+
+    def logic_chunks() -> Iterator[str]:
+        yield "# Generated by ASET\n\n"
+        for code in codes:
+            yield code
+            yield "\n\n"
 
-    write_text(project_dir / "logic.py", "".join(logic_parts))
+    write_text(project_dir / "logic.py", logic_chunks())
 
     # 🔒 Hard gate: validate logic.py imports and contains all fragment functions
     validate_generated_logic(project_dir, blueprint)